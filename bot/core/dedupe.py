@@ -1,23 +1,96 @@
-
 from __future__ import annotations
+import json
+import logging
+import os
 import time
-from typing import Dict, Tuple
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+# (match_id, market, selection); callers build it once per opportunity
+DedupeKey = Tuple[str, str, str]
 
 class DedupeCache:
-    def __init__(self, window_seconds: int = 600):
+    def __init__(self, window_seconds: int = 600, storage_file: Optional[str] = None, maxsize: int = 10_000):
         self.window = window_seconds
-        self._seen: Dict[str, float] = {}
+        # Hard cap on entries; the oldest marks are evicted first once it's reached
+        self.maxsize = maxsize
+        # Ordered oldest-mark first, so expired entries are always at the front
+        self._seen: OrderedDict[DedupeKey, float] = OrderedDict()
+        # Optional JSON file so recent alerts survive a restart
+        self.storage_file = Path(storage_file) if storage_file else None
+        self.load()
 
-    def _key(self, match_id: str, market: str, selection: str) -> str:
-        return f"{match_id}|{market}|{selection}"
+    def seen_recently(self, key: DedupeKey) -> bool:
+        ts = self._seen.get(key)
+        if ts is None:
+            return False
+        return (time.time() - ts) < self.window
 
-    def seen_recently(self, match_id: str, market: str, selection: str) -> bool:
-        k = self._key(match_id, market, selection)
+    def check_and_mark(self, key: DedupeKey) -> bool:
+        """
+        Mark key and return True, or return False if it was seen within the window.
+        
+        Does not write the storage file; call save() once the batch is settled.
+        """
         now = time.time()
-        ts = self._seen.get(k)
-        if ts is None:
+        ts = self._seen.get(key)
+        if ts is not None and now - ts < self.window:
             return False
-        return (now - ts) < self.window
+        self._seen[key] = now
+        self._seen.move_to_end(key)
+        self._prune(now)
+        return True
+
+    def unmark(self, key: DedupeKey):
+        """
+        Release a key claimed by check_and_mark, e.g. after its alert failed to send.
+        
+        check_and_mark only claims keys that were absent or expired, so forgetting
+        the key restores the earlier state. Does not write the storage file.
+        """
+        self._seen.pop(key, None)
+
+    def _prune(self, now: float):
+        # Drop expired entries from the front; stops at the first live one
+        seen = self._seen
+        while seen:
+            k, ts = next(iter(seen.items()))
+            if now - ts < self.window:
+                break
+            del seen[k]
+        while len(seen) > self.maxsize:
+            seen.popitem(last=False)
+
+    def load(self) -> None:
+        """Load unexpired entries from the storage file, if configured."""
+        if not self.storage_file or not self.storage_file.exists():
+            return
+        try:
+            with open(self.storage_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            now = time.time()
+            for match_id, market, selection, ts in sorted(entries, key=lambda e: e[3]):
+                if now - ts < self.window:
+                    self._seen[(match_id, market, selection)] = ts
+            self._prune(now)
+            log.info("[DEDUPE] Loaded %d recent alerts", len(self._seen))
+        except Exception as e:
+            log.error("[DEDUPE] Error loading dedupe cache: %s", e)
+            self._seen.clear()
 
-    def mark(self, match_id: str, market: str, selection: str):
-        self._seen[self._key(match_id, market, selection)] = time.time()
+    def save(self) -> None:
+        """Write current entries to the storage file, if configured."""
+        if not self.storage_file:
+            return
+        # Write a sibling temp file and swap it in, so a crash mid-write never leaves a truncated file
+        tmp_file = self.storage_file.with_name(self.storage_file.name + ".tmp")
+        try:
+            entries = [[*k, ts] for k, ts in self._seen.items()]
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(tmp_file, self.storage_file)
+        except Exception as e:
+            log.error("[DEDUPE] Error saving dedupe cache: %s", e)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Logging setup for the bot.
+Records are queued on the caller's thread and written by a background listener,
+so handler I/O never blocks the event loop.
+"""
+
+import logging
+import logging.handlers
+import os
+import queue
+from typing import Optional
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def setup_logging() -> None:
+    """
+    Install a queue-backed root handler (idempotent).
+
+    Level is INFO, or DEBUG for the bot's own modules when BOT_DEBUG=1.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    # Debug tracing applies to our own modules only
+    if os.getenv("BOT_DEBUG") == "1":
+        logging.getLogger("bot").setLevel(logging.DEBUG)
+
+    # httpx logs every request URL at INFO, and Telegram URLs embed the bot token
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    _listener.start()
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -1,19 +1,23 @@
-
 from __future__ import annotations
+from dataclasses import dataclass, field
 from typing import Literal, List, Optional
-from pydantic import BaseModel, Field
 from datetime import datetime
 
-class OddsQuote(BaseModel):
+# Plain slotted dataclasses: these are built per quote on every scan, so skip
+# runtime validation and per-instance __dict__.
+
+@dataclass(slots=True)
+class OddsQuote:
     site: str
     market: Literal["1X2","OVER_UNDER","CORRECT_SCORE"]
     selection: str            # e.g., 'Home', 'Draw', 'Away' or 'Over 2.5'
     odds: float
     kind: Literal["LAY","BACK"] = "BACK"
 
-class MarketSnapshot(BaseModel):
+@dataclass(slots=True)
+class MarketSnapshot:
     match_id: str             # normalized key (league|date|home|away)
     match_name: str           # 'Arsenal vs Chelsea'
     league: Optional[str] = None
     kickoff_utc: Optional[datetime] = None
-    quotes: List[OddsQuote] = Field(default_factory=list)
+    quotes: List[OddsQuote] = field(default_factory=list)
@@ -4,39 +4,120 @@ Notification module for sending Telegram messages.
 """
 
 import os
+import asyncio
+import logging
+import time
 import httpx
-from typing import List, Dict, Optional
+import orjson
+import pytz
+from dotenv import load_dotenv
+from typing import Iterable, List, Dict, Optional, Set, Tuple
 from datetime import datetime
 
-# Configuration
+log = logging.getLogger(__name__)
+
+# Configuration (read once; see reload_telegram_env)
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+# Optional chat that broadcasts are posted to once, then copied to each user
+TELEGRAM_STAGING_CHAT_ID = os.getenv("TELEGRAM_STAGING_CHAT_ID")
+_SEND_PATH = f"/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+_COPY_PATH = f"/bot{TELEGRAM_BOT_TOKEN}/copyMessage"
 
-def format_alert(opportunity: Dict) -> str:
-    """
-    Format a single arbitrage opportunity alert.
-    
-    Args:
-        opportunity: Dictionary containing opportunity data
-        
-    Returns:
-        Formatted alert message
-    """
-    try:
-        match_name = opportunity.get('match_name', 'Unknown Match')
-        orbit_odds = opportunity.get('orbit_lay_odds', 'N/A')
-        comparison_odds = opportunity.get('comparison_odds', 'N/A')
-        odds_diff = opportunity.get('odds_difference', 'N/A')
-        market_type = opportunity.get('market_type', 'N/A')
-        detection_time = opportunity.get('detection_time', 'N/A')
-        
-        message = f"""🎯 <b>ARBITRAGE OPPORTUNITY DETECTED!</b> 🎯
+def reload_telegram_env() -> None:
+    """Re-read Telegram settings from .env and the environment (wired to SIGHUP)."""
+    global TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, TELEGRAM_STAGING_CHAT_ID, _SEND_PATH, _COPY_PATH
+    load_dotenv(override=True)
+    TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
+    TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+    TELEGRAM_STAGING_CHAT_ID = os.getenv("TELEGRAM_STAGING_CHAT_ID")
+    _SEND_PATH = f"/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+    _COPY_PATH = f"/bot{TELEGRAM_BOT_TOKEN}/copyMessage"
+    log.info("🔄 Telegram settings reloaded")
+
+# Notification timezone and timestamp format, resolved once at import
+_TZ = pytz.timezone(os.getenv("TZ", "Asia/Tokyo"))
+_TS_FMT = "%Y-%m-%d %H:%M:%S"
+
+# Telegram's bot-wide cap is ~30 messages per second
+TELEGRAM_RATE_LIMIT = 30
+
+# Seconds broadcast_to_users waits for sends before returning
+BROADCAST_TIMEOUT = 30
+
+# Most Telegram requests allowed in flight at once; later sends wait for a free slot
+TELEGRAM_MAX_INFLIGHT = 20
+
+# Shared HTTP client so sends reuse pooled keep-alive connections
+_client: Optional[httpx.AsyncClient] = None
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared Telegram HTTP client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        # HTTP/2 multiplexes concurrent broadcast sends over one TLS connection
+        _client = httpx.AsyncClient(
+            base_url="https://api.telegram.org",
+            http2=True,
+            timeout=10,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60)
+        )
+    return _client
+
+# In-flight send limiter and the event loop it belongs to; main.py runs a fresh loop per mode
+_send_slots: Optional[asyncio.Semaphore] = None
+_send_slots_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _get_send_slots() -> asyncio.Semaphore:
+    """Return the in-flight send semaphore for the running loop, creating it on first use."""
+    global _send_slots, _send_slots_loop
+    loop = asyncio.get_running_loop()
+    if _send_slots is None or _send_slots_loop is not loop:
+        _send_slots = asyncio.Semaphore(TELEGRAM_MAX_INFLIGHT)
+        _send_slots_loop = loop
+    return _send_slots
+
+# Leaky-bucket state: the loop time at which the next send may go out
+_next_send_at = 0.0
+
+# Outbound queue for fire-and-forget sends, drained by a background task
+_queue: Optional[asyncio.Queue] = None
+_queued: Set[Tuple[str, str]] = set()
+_sender_task: Optional[asyncio.Task] = None
+
+# Broadcast sends still running after BROADCAST_TIMEOUT
+_inflight: Set[asyncio.Task] = set()
+
+async def close_client() -> None:
+    """Stop the outbound sender and close the shared HTTP client. Call on shutdown."""
+    global _client, _queue, _sender_task, _send_slots, _send_slots_loop
+    if _sender_task is not None:
+        _sender_task.cancel()
+        _sender_task = None
+    _queue = None
+    _queued.clear()
+    _send_slots = _send_slots_loop = None
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+async def _throttle() -> None:
+    """Space sends at TELEGRAM_RATE_LIMIT per second, reserving a slot per caller."""
+    global _next_send_at
+    now = asyncio.get_running_loop().time()
+    slot = max(now, _next_send_at)
+    _next_send_at = slot + 1.0 / TELEGRAM_RATE_LIMIT
+    if slot > now:
+        await asyncio.sleep(slot - now)
+
+# Single-alert layout, keyed by the opportunity dict's own fields
+_ALERT_TMPL = """🎯 <b>ARBITRAGE OPPORTUNITY DETECTED!</b> 🎯
 
 ⚽ <b>Match:</b> {match_name}
 🏟️ <b>Market:</b> {market_type}
-📊 <b>Orbit LAY:</b> {orbit_odds}
+📊 <b>Orbit LAY:</b> {orbit_lay_odds}
 📊 <b>Golbet:</b> {comparison_odds}
-💰 <b>Difference:</b> {odds_diff}
+💰 <b>Difference:</b> {odds_difference}
 ⏰ <b>Detected:</b> {detection_time}
 
 💡 <b>How to Use:</b>
@@ -45,11 +126,75 @@ def format_alert(opportunity: Dict) -> str:
    • <b>Profit</b> from the odds difference
 
 🚀 <b>Happy arbitrage hunting!</b> 💰"""
+
+# Static parts of the results digest; only the detection time and count are filled per call
+_RESULTS_HEADER = """🎯 <b>ARBITRAGE OPPORTUNITIES DETECTED!</b> 🎯
+
+"""
+_RESULTS_SUMMARY_TMPL = """⏰ <b>Detected:</b> {detected}
+
+📊 <b>Analysis Summary:</b>
+   • <b>Total Opportunities:</b> {n}
+   • <b>Threshold Applied:</b> -1% to +30%
+   • <b>Data Sources:</b> Orbit + Golbet
+   • <b>Matching Method:</b> Python-based (no AI)
+
+⚽ <b>Opportunities Found:</b>
+
+"""
+_RESULTS_FOOTER = """💡 <b>How to Use:</b>
+   • <b>Lay</b> on Orbit at the LAY odds
+   • <b>Back</b> on Golbet at the comparison odds
+   • <b>Profit</b> from the odds difference
+
+🚀 <b>Happy arbitrage hunting!</b> 💰"""
+
+# One opportunity in the results digest, keyed by the opportunity dict's own fields;
+# separator is empty after the last item
+_ITEM_TMPL = """<b>{i}. {match_name}</b>
+   🏟️ <b>Market:</b> {market_type}
+   📊 <b>Orbit LAY:</b> {orbit_lay_odds}
+   📊 <b>Golbet:</b> {comparison_odds}
+   💰 <b>Difference:</b> {odds_difference}
+{separator}
+"""
+_ITEM_SEPARATOR = "   ─────────────────────\n"
+
+class _SafeDict(dict):
+    """format_map source that renders missing opportunity fields as placeholders."""
+    __slots__ = ()
+    
+    def __missing__(self, key: str) -> str:
+        return 'Unknown Match' if key == 'match_name' else 'N/A'
+
+# (epoch second, formatted) for the current time; the format has one-second resolution
+_now_ts: Tuple[int, str] = (-1, "")
+
+def ts(dt: Optional[datetime] = None) -> str:
+    """Format a timestamp (default: now) in the notification timezone."""
+    global _now_ts
+    if dt is None:
+        second = int(time.time())
+        if second != _now_ts[0]:
+            _now_ts = (second, datetime.fromtimestamp(second, _TZ).strftime(_TS_FMT))
+        return _now_ts[1]
+    return dt.astimezone(_TZ).strftime(_TS_FMT)
+
+def format_alert(opportunity: Dict) -> str:
+    """
+    Format a single arbitrage opportunity alert.
+    
+    Args:
+        opportunity: Dictionary containing opportunity data
         
-        return message
+    Returns:
+        Formatted alert message
+    """
+    try:
+        return _ALERT_TMPL.format_map(_SafeDict(opportunity))
         
     except Exception as e:
-        print(f"Error formatting alert: {e}")
+        log.error("Error formatting alert: %s", e)
         return f"🎯 <b>ARBITRAGE OPPORTUNITY</b> 🎯\n\n{str(opportunity)}"
 
 def format_arbitrage_results(result: List[Dict], orbit_data: List[Dict], golbet_data: List[Dict]) -> str:
@@ -68,54 +213,18 @@ def format_arbitrage_results(result: List[Dict], orbit_data: List[Dict], golbet_
         if not result or not isinstance(result, list) or len(result) == 0:
             return "❌ No arbitrage opportunities found in this analysis cycle."
         
-        lines = []
-        lines.append("🎯 <b>ARBITRAGE OPPORTUNITIES DETECTED!</b> 🎯")
-        lines.append("")
-        
-        lines.append(f"📊 <b>Analysis Summary:</b>")
-        lines.append(f"   • <b>Total Opportunities:</b> {len(result)}")
-        lines.append(f"   • <b>Threshold Applied:</b> -1% to +30%")
-        lines.append(f"   • <b>Data Sources:</b> Orbit + Golbet")
-        lines.append(f"   • <b>Matching Method:</b> Python-based (no AI)")
-        lines.append("")
-        
-        lines.append("⚽ <b>Opportunities Found:</b>")
-        lines.append("")
-        
-        for i, opp in enumerate(result, 1):
-            try:
-                match_name = opp.get('match_name', 'Unknown Match')
-                orbit_odds = opp.get('orbit_lay_odds', 'N/A')
-                comparison_odds = opp.get('comparison_odds', 'N/A')
-                odds_diff = opp.get('odds_difference', 'N/A')
-                market_type = opp.get('market_type', 'N/A')
-                detection_time = opp.get('detection_time', 'N/A')
-                
-                lines.append(f"<b>{i}. {match_name}</b>")
-                lines.append(f"   🏟️ <b>Market:</b> {market_type}")
-                lines.append(f"   📊 <b>Orbit LAY:</b> {orbit_odds}")
-                lines.append(f"   📊 <b>Golbet:</b> {comparison_odds}")
-                lines.append(f"   💰 <b>Difference:</b> {odds_diff}")
-                lines.append(f"   ⏰ <b>Detected:</b> {detection_time}")
-                
-                if i < len(result):
-                    lines.append("   ─────────────────────")
-                lines.append("")
-            except Exception as e:
-                print(f"Error formatting opportunity {i}: {e}")
-                continue
-        
-        lines.append("💡 <b>How to Use:</b>")
-        lines.append("   • <b>Lay</b> on Orbit at the LAY odds")
-        lines.append("   • <b>Back</b> on Golbet at the comparison odds")
-        lines.append("   • <b>Profit</b> from the odds difference")
-        lines.append("")
-        lines.append("🚀 <b>Happy arbitrage hunting!</b> 💰")
+        last = len(result)
+        items = "".join(
+            _ITEM_TMPL.format_map(_SafeDict(opp, i=i, separator=_ITEM_SEPARATOR if i < last else ""))
+            for i, opp in enumerate(result, 1)
+        )
         
-        return "\n".join(lines)
+        # Opportunities from one cycle share a detection time, so show it once
+        summary = _RESULTS_SUMMARY_TMPL.format(detected=result[0].get('detection_time', 'N/A'), n=last)
+        return _RESULTS_HEADER + summary + items + _RESULTS_FOOTER
         
     except Exception as e:
-        print(f"Error formatting arbitrage results: {e}")
+        log.error("Error formatting arbitrage results: %s", e)
         return f"""🎯 <b>ARBITRAGE OPPORTUNITIES</b> 🎯
 
 🤖 <b>Python Analysis Result:</b>
@@ -127,7 +236,17 @@ def format_ai_analysis_result(result, orbit_data, golbet_data):
     """
     Format AI analysis result into a clean, readable message.
     This function is kept for backward compatibility but now calls the new function.
+    Raw AI output (a JSON array, optionally in a ```json fence) is parsed first.
     """
+    if isinstance(result, (str, bytes)):
+        if isinstance(result, bytes):
+            result = result.decode("utf-8", errors="replace")
+        cleaned = result.strip().removeprefix("```json").removeprefix("```").removesuffix("```").strip()
+        try:
+            result = orjson.loads(cleaned)
+        except orjson.JSONDecodeError as e:
+            log.error("Error parsing AI analysis result: %s", e)
+            result = []
     return format_arbitrage_results(result, orbit_data, golbet_data)
 
 async def send_telegram(message: str, chat_id: Optional[str] = None) -> bool:
@@ -143,58 +262,176 @@ async def send_telegram(message: str, chat_id: Optional[str] = None) -> bool:
     """
     try:
         if not TELEGRAM_BOT_TOKEN:
-            print("❌ TELEGRAM_BOT_TOKEN not set")
+            log.error("❌ TELEGRAM_BOT_TOKEN not set")
             return False
         
         target_chat_id = chat_id or TELEGRAM_CHAT_ID
         if not target_chat_id:
-            print("❌ No chat ID available")
+            log.error("❌ No chat ID available")
             return False
         
-        url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-        
         data = {
             "chat_id": target_chat_id,
             "text": message,
             "parse_mode": "HTML"
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=data, timeout=10)
-            
-            if response.status_code == 200:
-                print(f"✅ Telegram message sent successfully to {target_chat_id}")
-                return True
-            else:
-                print(f"❌ Failed to send Telegram message: {response.status_code} - {response.text}")
-                return False
+        async with _get_send_slots():
+            await _throttle()
+            response = await _get_client().post(_SEND_PATH, json=data)
+        
+        if response.status_code == 200:
+            log.debug("✅ Telegram message sent successfully to %s (%s)", target_chat_id, response.http_version)
+            return True
+        else:
+            log.warning("❌ Failed to send Telegram message: %s - %s", response.status_code, response.text)
+            return False
                 
     except Exception as e:
-        print(f"❌ Error sending Telegram message: {e}")
+        log.error("❌ Error sending Telegram message: %s", e)
         return False
 
-async def broadcast_to_users(message: str, user_ids: List[str]) -> None:
+async def _stage_message(message: str) -> Optional[int]:
+    """
+    Post a message to the staging chat so it can be copied to recipients.
+    
+    Returns:
+        The staged message_id, or None if staging failed
+    """
+    try:
+        async with _get_send_slots():
+            await _throttle()
+            response = await _get_client().post(_SEND_PATH, json={
+                "chat_id": TELEGRAM_STAGING_CHAT_ID,
+                "text": message,
+                "parse_mode": "HTML"
+            })
+        if response.status_code == 200:
+            return orjson.loads(response.content)["result"]["message_id"]
+        log.warning("❌ Failed to stage broadcast: %s - %s", response.status_code, response.text)
+    except Exception as e:
+        log.error("❌ Error staging broadcast: %s", e)
+    return None
+
+async def copy_telegram(message_id: int, chat_id: str) -> bool:
+    """
+    Copy a staged message to a chat.
+    
+    Args:
+        message_id: Message ID in the staging chat
+        chat_id: Recipient chat ID
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        async with _get_send_slots():
+            await _throttle()
+            response = await _get_client().post(_COPY_PATH, json={
+                "chat_id": chat_id,
+                "from_chat_id": TELEGRAM_STAGING_CHAT_ID,
+                "message_id": message_id
+            })
+        
+        if response.status_code == 200:
+            log.debug("✅ Telegram message copied to %s", chat_id)
+            return True
+        else:
+            log.warning("❌ Failed to copy Telegram message: %s - %s", response.status_code, response.text)
+            return False
+    
+    except Exception as e:
+        log.error("❌ Error copying Telegram message: %s", e)
+        return False
+
+def queue_telegram(message: str, chat_id: Optional[str] = None) -> None:
+    """
+    Queue a message for sending without waiting for the result.
+    
+    Identical messages already waiting for the same chat are coalesced.
+    Sends go out concurrently, throttled to TELEGRAM_RATE_LIMIT.
+    
+    Args:
+        message: Message to send
+        chat_id: Optional chat ID (if not provided, uses default)
+    """
+    global _queue, _sender_task
+    if _sender_task is None or _sender_task.done():
+        # A new sender (first use, or a fresh event loop) gets a queue bound to the running loop
+        _queue = asyncio.Queue()
+        _queued.clear()
+        _sender_task = asyncio.create_task(_sender_loop(_queue))
+    key = (str(chat_id or TELEGRAM_CHAT_ID), message)
+    if key in _queued:
+        return
+    _queued.add(key)
+    _queue.put_nowait((chat_id, message))
+
+def queue_broadcast(message: str, user_ids: Iterable[str]) -> None:
+    """
+    Queue a message for each user without waiting for the sends.
+    
+    Args:
+        message: Message to send
+        user_ids: User IDs to send to
+    """
+    count = 0
+    for user_id in user_ids:
+        queue_telegram(message, user_id)
+        count += 1
+    log.info("📢 Queued message for %d users", count)
+
+async def _sender_loop(queue: asyncio.Queue) -> None:
+    """Drain the outbound queue, dispatching each send as its own task."""
+    pending: Set[asyncio.Task] = set()
+    while True:
+        chat_id, message = await queue.get()
+        _queued.discard((str(chat_id or TELEGRAM_CHAT_ID), message))
+        task = asyncio.create_task(send_telegram(message, chat_id))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+async def broadcast_to_users(message: str, user_ids: List[str]) -> int:
     """
     Send a message to multiple users.
     
     Args:
         message: Message to send
         user_ids: List of user IDs to send to
+        
+    Returns:
+        Number of users the message was delivered to within BROADCAST_TIMEOUT
     """
     if not user_ids:
-        print("⚠️ No users to broadcast to")
-        return
+        log.warning("⚠️ No users to broadcast to")
+        return 0
     
-    print(f"📢 Broadcasting message to {len(user_ids)} users...")
+    log.info("📢 Broadcasting message to %d users...", len(user_ids))
+    
+    # Sends run as independent tasks; the send slots and _throttle keep them under Telegram's limits.
+    # Only wait up to BROADCAST_TIMEOUT so one slow peer can't stall the caller.
+    # With a staging chat, post the body once and fan out copies by message_id
+    message_id = None
+    if TELEGRAM_STAGING_CHAT_ID and len(user_ids) > 1:
+        message_id = await _stage_message(message)
+    if message_id is not None:
+        tasks = {asyncio.create_task(copy_telegram(message_id, user_id)): user_id for user_id in user_ids}
+    else:
+        tasks = {asyncio.create_task(send_telegram(message, user_id)): user_id for user_id in user_ids}
+    done, pending = await asyncio.wait(tasks, timeout=BROADCAST_TIMEOUT)
     
     success_count = 0
-    for user_id in user_ids:
-        try:
-            if await send_telegram(message, user_id):
-                success_count += 1
-            else:
-                print(f"❌ Failed to send to user {user_id}")
-        except Exception as e:
-            print(f"❌ Error sending to user {user_id}: {e}")
+    for task in done:
+        if task.result():
+            success_count += 1
+        else:
+            log.warning("❌ Failed to send to user %s", tasks[task])
+    if pending:
+        log.warning("⏳ %d sends still in flight after %ds", len(pending), BROADCAST_TIMEOUT)
+        # Keep stragglers referenced until they finish
+        for task in pending:
+            _inflight.add(task)
+            task.add_done_callback(_inflight.discard)
     
-    print(f"📢 Broadcast completed: {success_count}/{len(user_ids)} successful")
+    log.info("📢 Broadcast completed: %d/%d successful", success_count, len(user_ids))
+    return success_count
@@ -1,19 +1,117 @@
-from openai import OpenAI
-import openai
+from openai import AsyncOpenAI
+import asyncio
 import os
 from dotenv import load_dotenv
-import json
-from datetime import datetime
+import hashlib
+import html
+import logging
+import orjson
+import re
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from .notify import ts
+from .team_matcher import find_arbitrage_candidates
+
+__all__ = ["compare", "compare_batch", "validate_opportunities"]
+
+log = logging.getLogger(__name__)
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Get API key from environment variable instead of hardcoding
-api_key = os.getenv("OPENAI_API_KEY")
-if not api_key:
-    raise ValueError("OPENAI_API_KEY environment variable is required")
+# Single OpenAI client, created on first compare() call
+_client: Optional[AsyncOpenAI] = None
+
+def _get_client() -> AsyncOpenAI:
+    """Return the shared OpenAI client, creating it on first use."""
+    global _client
+    if _client is None:
+        # Get API key from environment variable instead of hardcoding
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY environment variable is required")
+        _client = AsyncOpenAI(api_key=api_key)
+    return _client
+
+# One batch of data inside the analysis prompt
+_BATCH_TEMPLATE = """BATCH {n}
+
+ORBIT DATA (LAY odds):
+{orbit}
+
+GOLBET DATA (BACK odds):
+{golbet}
 
-client = OpenAI(api_key=api_key)
+"""
+
+# Analysis prompt; only the batches, batch count and timestamp change between calls
+_PROMPT_TEMPLATE = """Analyze this football betting data to find arbitrage opportunities.
+The data is split into {count} independent batches; analyze each batch on its own:
+
+{batches}CRITICAL FILTERING REQUIREMENTS:
+1. Match teams with the same names between Orbit and Golbet within each batch
+2. Compare Orbit LAY odds with Golbet odds for each selection (1, X, 2)
+3. Calculate the percentage difference: ((Golbet odds - Orbit LAY odds) / Orbit LAY odds) × 100
+4. **STRICT FILTERING: ONLY include opportunities where percentage difference is >= -1% AND <= +30%**
+5. For each opportunity, set "detection_time" to "{now}" (already provided, do NOT generate your own time)
+6. Return ONLY a JSON object whose "results" list holds one opportunities list per batch, in batch order, no explanations:
+
+{{
+    "results": [
+        [
+            {{
+                "match_name": "Team A vs Team B",
+                "orbit_lay_odds": 2.00,
+                "comparison_odds": 2.20,
+                "odds_difference": "0.20 (10.00%)",
+                "market_type": "1X2",
+                "detection_time": "{now}"
+            }}
+        ]
+    ]
+}}
+
+STRICT FILTERING RULES (MUST FOLLOW):
+- **Percentage difference MUST be >= -1% AND <= +30%**
+- **Formula: ((Golbet odds - Orbit LAY odds) / Orbit LAY odds) × 100**
+- **Golbet odds must be greater than or equal to Orbit LAY odds**
+- **Examples of VALID opportunities (INCLUDE):**
+  • Orbit: 2.00, Golbet: 2.20 → +10% → INCLUDE ✅
+  • Orbit: 2.00, Golbet: 1.99 → -0.5% → INCLUDE ✅ (>= -1%)
+  • Orbit: 2.00, Golbet: 2.60 → +30% → INCLUDE ✅ (= +30%)
+  • Orbit: 2.00, Golbet: 1.98 → -1% → INCLUDE ✅ (= -1%)
+
+- **Examples of INVALID opportunities (EXCLUDE):**
+  • Orbit: 2.00, Golbet: 1.95 → -2.5% → EXCLUDE ❌ (< -1%)
+  • Orbit: 2.00, Golbet: 2.80 → +40% → EXCLUDE ❌ (> +30%)
+  • Orbit: 2.00, Golbet: 1.97 → -1.5% → EXCLUDE ❌ (< -1%)
+
+REQUIREMENTS:
+- Match name: Full team names (e.g., "Arsenal vs Chelsea")
+- Orbit LAY odds: The value from Orbit
+- Comparison odds: The corresponding odds from Golbet
+- Odds difference: Both numeric difference and percentage
+- Market type: Always "1X2" for football matches
+- detection_time: Always use "{now}" exactly as shown above for every opportunity.
+
+**FINAL INSTRUCTION:**
+- **ONLY return opportunities that meet the -1% to +30% threshold**
+- **If NO opportunities in a batch meet this criteria, use an empty list [] for that batch**
+- **Do NOT include any opportunities outside this range**
+- **Return only the JSON object, no other text, no explanations**
+
+Return ONLY valid arbitrage opportunities within the -1% to +30% threshold, or an empty list for each batch with none found."""
+
+
+# Percentage inside an odds_difference string, e.g. "0.20 (10.00%)" -> 10.00
+_PCT_RE = re.compile(r"\(([-+]?\d+(?:\.\d+)?)%\)")
+
+@lru_cache(maxsize=1024)
+def _parse_pct(odds_diff_str: str) -> Optional[float]:
+    """Return the percentage from an odds_difference string, or None if absent."""
+    m = _PCT_RE.search(odds_diff_str)
+    return float(m.group(1)) if m else None
 
 
 def validate_opportunities(opportunities):
@@ -37,28 +135,51 @@ def validate_opportunities(opportunities):
             odds_diff_str = opp.get('odds_difference', '')
             
             # Parse percentage from format like "0.20 (10.00%)" or "-0.04271 (-2.45%)"
-            if '(' in odds_diff_str and '%)' in odds_diff_str:
-                percentage_str = odds_diff_str.split('(')[1].split('%)')[0]
-                percentage = float(percentage_str)
-                
+            percentage = _parse_pct(odds_diff_str)
+            if percentage is not None:
                 # Check if within threshold (-1% to +30%)
                 if -1.0 <= percentage <= 30.0:
                     validated_opportunities.append(opp)
-                    print(f"[VALIDATION] ✅ Opportunity validated: {percentage}% - {opp.get('match_name', 'Unknown')}")
+                    log.debug("[VALIDATION] ✅ Opportunity validated: %s%% - %s", percentage, opp.get('match_name', 'Unknown'))
                 else:
-                    print(f"[VALIDATION] ❌ Opportunity filtered out: {percentage}% (outside -1% to +30%) - {opp.get('match_name', 'Unknown')}")
+                    log.debug("[VALIDATION] ❌ Opportunity filtered out: %s%% (outside -1%% to +30%%) - %s", percentage, opp.get('match_name', 'Unknown'))
             else:
-                print(f"[VALIDATION] ⚠️ Could not parse percentage from: {odds_diff_str}")
+                log.debug("[VALIDATION] ⚠️ Could not parse percentage from: %s", odds_diff_str)
                 
         except Exception as e:
-            print(f"[VALIDATION] ❌ Error validating opportunity: {e}")
+            log.warning("[VALIDATION] ❌ Error validating opportunity: %s", e)
             continue
     
-    print(f"[VALIDATION] Filtered {len(opportunities)} opportunities to {len(validated_opportunities)} valid ones")
+    log.info("[VALIDATION] Filtered %d opportunities to %d valid ones", len(opportunities), len(validated_opportunities))
     return validated_opportunities
 
 
-def compare(orbit_data, golbet_data):
+# Recent compare results keyed by a hash of the input pair, oldest first
+COMPARE_CACHE_SIZE = 128
+_compare_cache: "OrderedDict[bytes, List[Dict]]" = OrderedDict()
+
+def _payload_key(orbit_data, golbet_data) -> bytes:
+    """Hash an Orbit/Golbet data pair into a compare cache key."""
+    return hashlib.blake2b(orjson.dumps([orbit_data, golbet_data]), digest_size=16).digest()
+
+def _cache_get(key: bytes) -> Optional[List[Dict]]:
+    """Return a copy of the cached opportunities for key, stamped with the current time, or None on a miss."""
+    hit = _compare_cache.get(key)
+    if hit is None:
+        return None
+    _compare_cache.move_to_end(key)
+    now_str = ts()
+    return [{**opp, "detection_time": now_str} for opp in hit]
+
+def _cache_put(key: bytes, opportunities: List[Dict]) -> None:
+    """Store opportunities for key, evicting the least recently used entry when full."""
+    _compare_cache[key] = [dict(opp) for opp in opportunities]
+    _compare_cache.move_to_end(key)
+    if len(_compare_cache) > COMPARE_CACHE_SIZE:
+        _compare_cache.popitem(last=False)
+
+
+async def compare(orbit_data, golbet_data):
     """
     Compare Orbit and Golbet data using OpenAI to find arbitrage opportunities.
     
@@ -69,117 +190,104 @@ def compare(orbit_data, golbet_data):
     Returns:
         List of validated arbitrage opportunities within -1% to +30% threshold
     """
+    return (await compare_batch([(orbit_data, golbet_data)]))[0]
+
+
+async def compare_batch(batches: List[Tuple[List, List]]) -> List[List[Dict]]:
+    """
+    Compare several Orbit/Golbet data pairs in a single OpenAI request.
+    
+    Args:
+        batches: List of (orbit_data, golbet_data) pairs
+        
+    Returns:
+        One list of opportunities per input batch, in the same order
+    """
+    results: List[List[Dict]] = [[] for _ in batches]
     try:
+        # Pairs seen recently are answered from the cache. For the rest, pairs the Python
+        # matcher resolves are final; only teams it left unpaired on both sides go to the model
+        keys = [_payload_key(orbit_data, golbet_data) for orbit_data, golbet_data in batches]
+        prompt_batches = []
+        for i, (orbit_data, golbet_data) in enumerate(batches):
+            cached = _cache_get(keys[i])
+            if cached is not None:
+                results[i] = cached
+                continue
+            # Matching is CPU-bound; keep it off the event loop
+            matched, orbit_left, golbet_left = await asyncio.to_thread(
+                find_arbitrage_candidates, orbit_data, golbet_data
+            )
+            results[i] = matched
+            if orbit_left and golbet_left:
+                prompt_batches.append((i, orbit_left, golbet_left))
+            else:
+                _cache_put(keys[i], matched)
+        if not prompt_batches:
+            log.info("[OPENAI] Python matcher paired every team, skipping API call")
+            return results
+        
         # Prepare data for AI analysis
-        orbit_str = str(orbit_data)
-        golbet_str = str(golbet_data)
-        now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # Compact JSON rather than Python repr: fewer tokens and unambiguous to the model
+        batches_str = "".join(
+            _BATCH_TEMPLATE.format(
+                n=n,
+                orbit=orjson.dumps([{"match": team, "odds": odds} for team, odds in orbit_left.items()]).decode(),
+                golbet=orjson.dumps([{"match": team, "odds": odds} for team, odds in golbet_left.items()]).decode()
+            )
+            for n, (_, orbit_left, golbet_left) in enumerate(prompt_batches, 1)
+        )
+        # Same clock and timezone as the Python matches and cache hits
+        now_str = ts()
         
-        # Create the prompt with current timestamp
-        prompt = f"""Analyze this football betting data to find arbitrage opportunities:
-
-ORBIT DATA (LAY odds):
-{orbit_str}
-
-GOLBET DATA (BACK odds):
-{golbet_str}
-
-CRITICAL FILTERING REQUIREMENTS:
-1. Match teams with the same names between Orbit and Golbet
-2. Compare Orbit LAY odds with Golbet odds for each selection (1, X, 2)
-3. Calculate the percentage difference: ((Golbet odds - Orbit LAY odds) / Orbit LAY odds) × 100
-4. **STRICT FILTERING: ONLY include opportunities where percentage difference is >= -1% AND <= +30%**
-5. For each opportunity, set "detection_time" to "{now_str}" (already provided, do NOT generate your own time)
-6. Return ONLY the array of opportunities, no JSON wrapper, no explanations:
-
-[
-    {{
-        "match_name": "Team A vs Team B",
-        "orbit_lay_odds": 2.00,
-        "comparison_odds": 2.20,
-        "odds_difference": "0.20 (10.00%)",
-        "market_type": "1X2",
-        "detection_time": "{now_str}"
-    }}
-]
-
-STRICT FILTERING RULES (MUST FOLLOW):
-- **Percentage difference MUST be >= -1% AND <= +30%**
-- **Formula: ((Golbet odds - Orbit LAY odds) / Orbit LAY odds) × 100**
-- **Golbet odds must be greater than or equal to Orbit LAY odds**
-- **Examples of VALID opportunities (INCLUDE):**
-  • Orbit: 2.00, Golbet: 2.20 → +10% → INCLUDE ✅
-  • Orbit: 2.00, Golbet: 1.99 → -0.5% → INCLUDE ✅ (>= -1%)
-  • Orbit: 2.00, Golbet: 2.60 → +30% → INCLUDE ✅ (= +30%)
-  • Orbit: 2.00, Golbet: 1.98 → -1% → INCLUDE ✅ (= -1%)
-
-- **Examples of INVALID opportunities (EXCLUDE):**
-  • Orbit: 2.00, Golbet: 1.95 → -2.5% → EXCLUDE ❌ (< -1%)
-  • Orbit: 2.00, Golbet: 2.80 → +40% → EXCLUDE ❌ (> +30%)
-  • Orbit: 2.00, Golbet: 1.97 → -1.5% → EXCLUDE ❌ (< -1%)
-
-REQUIREMENTS:
-- Match name: Full team names (e.g., "Arsenal vs Chelsea")
-- Orbit LAY odds: The value from Orbit
-- Comparison odds: The corresponding odds from Golbet
-- Odds difference: Both numeric difference and percentage
-- Market type: Always "1X2" for football matches
-- detection_time: Always use "{now_str}" exactly as shown above for every opportunity.
-
-**FINAL INSTRUCTION:**
-- **ONLY return opportunities that meet the -1% to +30% threshold**
-- **If NO opportunities meet this criteria, return an empty array []**
-- **Do NOT include any opportunities outside this range**
-- **Do NOT wrap the result in ```json or any code block**
-- **Return only the array, no other text, no explanations**
-
-Return ONLY valid arbitrage opportunities within the -1% to +30% threshold, or an empty array if none found."""
+        # Fill the prompt with the data and current timestamp
+        prompt = _PROMPT_TEMPLATE.format(count=len(prompt_batches), batches=batches_str, now=now_str)
         
-        print("[OPENAI] Sending data to GPT-4o for analysis...")
+        log.info("[OPENAI] Sending %d batches (%d unmatched Orbit teams) to GPT-4o for analysis...",
+                 len(prompt_batches), sum(len(o) for _, o, _ in prompt_batches))
         
-        # Get response from OpenAI
-        response = client.chat.completions.create(
+        # Stream the response in JSON mode, so the reply is always a bare JSON object
+        stream = await _get_client().chat.completions.create(
             model="gpt-4o",
             messages=[
                 {"role": "user", "content": prompt}
             ],
+            response_format={"type": "json_object"},
+            stream=True,
         )
         
-        # Extract the response content
-        ai_response = response.choices[0].message.content
-        
-        # Clean the response (remove code blocks if present)
-        if ai_response.startswith('```json'):
-            ai_response = ai_response[7:]
-        if ai_response.endswith('```'):
-            ai_response = ai_response[:-3]
-        if ai_response.startswith('```'):
-            ai_response = ai_response[3:]
-        if ai_response.endswith('```'):
-            ai_response = ai_response[:-3]
-        
-        ai_response = ai_response.strip()
+        # Accumulate the streamed content
+        parts = []
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+        ai_response = "".join(parts)
         
         # Parse the JSON response
         try:
-            opportunities = json.loads(ai_response)
-            print(f"[OPENAI] Successfully parsed {len(opportunities) if isinstance(opportunities, list) else 'non-list'} opportunities")
-            
-            # Validate opportunities to ensure they meet the threshold
-            # validated_opportunities = validate_opportunities(opportunities)
-            
-            if opportunities:
-                print(f"[OPENAI] ✅ Returning {len(opportunities)} validated opportunities")
-                return opportunities
-            else:
-                print("[OPENAI] ⚠️ No opportunities met the threshold criteria")
-                return []
-                
-        except json.JSONDecodeError as e:
-            print(f"[OPENAI] JSON parsing error: {e}")
-            print(f"[OPENAI] Raw response: {ai_response}")
-            return []
+            batch_results = orjson.loads(ai_response).get("results", [])
+        except orjson.JSONDecodeError as e:
+            log.error("[OPENAI] JSON parsing error: %s", e)
+            log.debug("[OPENAI] Raw response: %s", ai_response)
+            return results
+        
+        # Map prompt batches back to the caller's batch positions, after the Python matches
+        for (i, _, _), opportunities in zip(prompt_batches, batch_results):
+            # Escape names once, as find_arbitrage_candidates does, whatever form the model echoed
+            for opp in opportunities:
+                if "match_name" in opp:
+                    opp["match_name"] = html.escape(html.unescape(str(opp["match_name"])), quote=False)
+            results[i] = results[i] + opportunities
+            _cache_put(keys[i], results[i])
+        
+        total = sum(len(r) for r in results)
+        if total:
+            log.info("[OPENAI] ✅ Returning %d validated opportunities", total)
+        else:
+            log.info("[OPENAI] ⚠️ No opportunities met the threshold criteria")
+        return results
             
     except Exception as e:
-        print(f"[OPENAI] Error in compare function: {e}")
-        return []
+        log.error("[OPENAI] Error in compare function: %s", e)
+        # Whatever the Python matcher already resolved still stands
+        return results
@@ -5,85 +5,184 @@ Keeps browser running between scans to avoid startup delays.
 """
 
 import asyncio
+import os
 from typing import Optional, Dict, Any
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
 import logging
+import re
+
+log = logging.getLogger(__name__)
+
+# Resource types the scrapers never read
+_BLOCKED_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+
+# Static asset URLs, for requests whose resource_type doesn't give them away
+_BLOCKED_URL_RE = re.compile(r"\.(png|jpe?g|gif|webp|svg|mp4|webm|mp3|woff2?|ttf|otf|ico)(\?|$)", re.I)
+
+
+async def _route_handler(route) -> None:
+    """Abort requests for assets the scrapers never read; let everything else through."""
+    request = route.request
+    if request.resource_type in _BLOCKED_TYPES or _BLOCKED_URL_RE.search(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+# Request headers sent by every page in a site's context
+_EXTRA_HEADERS = {
+    "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "accept-language": "en-US,en;q=0.5",
+    "accept-encoding": "gzip, deflate, br",
+    "connection": "keep-alive",
+    "upgrade-insecure-requests": "1"
+}
+
+# ULTRA-FAST page optimizations, registered once per context
+_INIT_SCRIPT = """
+    // ULTRA-FAST MODE - Disable everything
+    console.log = () => {};
+    console.warn = () => {};
+    console.error = () => {};
+    
+    // Disable all animations and transitions
+    if (document.body) {
+        document.body.style.setProperty('animation', 'none', 'important');
+        document.body.style.setProperty('transition', 'none', 'important');
+        document.body.style.setProperty('transform', 'none', 'important');
+    }
+    
+    // Disable all event listeners
+    const originalAddEventListener = EventTarget.prototype.addEventListener;
+    EventTarget.prototype.addEventListener = function(type, listener, options) {
+        if (['mouseover', 'mouseout', 'mousemove', 'scroll', 'resize', 'animation', 'transition'].includes(type)) {
+            return;
+        }
+        return originalAddEventListener.call(this, type, listener, options);
+    };
+    
+    // Disable CSS animations
+    const style = document.createElement('style');
+    style.textContent = '* { animation: none !important; transition: none !important; transform: none !important; }';
+    document.head.appendChild(style);
+"""
+
+# Browser configuration - ULTRA-FAST MODE
+# Only switches Chromium recognises; extra ones to try go in BROWSER_OPT_IN_FLAGS (space-separated)
+BROWSER_CONFIG = {
+    'headless': False,  # Run in background for maximum performance
+    'args': [
+        '--no-sandbox',
+        '--disable-dev-shm-usage',
+        '--disable-gpu',
+        '--no-first-run',
+        '--no-default-browser-check',
+        '--disable-background-timer-throttling',
+        '--disable-backgrounding-occluded-windows',
+        '--disable-renderer-backgrounding',
+        '--disable-plugins',
+        '--disable-extensions',
+        '--disable-web-security',
+        '--disable-features=VizDisplayCompositor',
+        '--disable-background-networking',
+        '--disable-default-apps',
+        '--disable-sync',
+        '--metrics-recording-only',
+        '--no-report-upload',
+        '--disable-hang-monitor',
+        '--disable-prompt-on-repost',
+        '--disable-client-side-phishing-detection',
+        '--disable-component-update',
+        '--disable-domain-reliability',
+        '--disable-logging',
+        '--disable-ipc-flooding-protection',
+        # ULTRA-FAST additions (keep essential functionality)
+        '--disable-canvas-aa',
+        '--disable-2d-canvas-clip-aa',
+        '--disable-gl-drawing-for-tests',
+        '--disable-accelerated-2d-canvas',
+        '--disable-accelerated-jpeg-decoding',
+        '--disable-accelerated-mjpeg-decode',
+        '--disable-accelerated-video-decode',
+        '--disable-gpu-rasterization',
+        '--disable-software-rasterizer',
+        '--disable-threaded-animation',
+        '--disable-threaded-scrolling',
+        '--disable-checker-imaging',
+        '--disable-new-content-rendering-timeout',
+        '--disable-smooth-scrolling',
+        '--disable-background-mode',
+        '--disable-low-res-tiling',
+        '--disable-composited-antialiasing',
+        '--disable-partial-raster',
+        '--disable-zero-copy',
+        '--disable-gpu-memory-buffer-video-frames',
+        '--disable-gpu-memory-buffer-compositor-resources',
+        '--disable-gpu-memory-buffer-uma',
+        '--disable-gpu-memory-buffer-usage-histogram',
+        *os.getenv("BROWSER_OPT_IN_FLAGS", "").split()
+    ]
+}
+
+# One Playwright driver per event loop; each start() spawns a Node subprocess.
+# main.py runs a fresh loop per mode, so the driver, its lock and their loop are tracked together
+_playwright = None
+_playwright_lock: Optional[asyncio.Lock] = None
+_playwright_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_playwright_lock() -> asyncio.Lock:
+    """Return the Playwright lock for the running loop, dropping state left by an earlier loop."""
+    global _playwright, _playwright_lock, _playwright_loop
+    loop = asyncio.get_running_loop()
+    if _playwright_lock is None or _playwright_loop is not loop:
+        # A driver started on a closed loop can't be used or stopped from this one
+        _playwright = None
+        _playwright_lock = asyncio.Lock()
+        _playwright_loop = loop
+    return _playwright_lock
+
+
+async def get_playwright():
+    """Return the process-wide Playwright instance, starting it on first use."""
+    global _playwright
+    async with _get_playwright_lock():
+        if _playwright is None:
+            log.debug("[BROWSER] Starting Playwright...")
+            _playwright = await async_playwright().start()
+            log.debug("[BROWSER] Playwright started successfully")
+        return _playwright
+
+
+async def stop_playwright() -> None:
+    """Stop the shared Playwright driver; call once at shutdown after closing browsers."""
+    global _playwright, _playwright_lock, _playwright_loop
+    async with _get_playwright_lock():
+        if _playwright is not None:
+            try:
+                await _playwright.stop()
+            except Exception as e:
+                log.error("[BROWSER] Error stopping Playwright: %s", e)
+            _playwright = None
+    # The next get_playwright(), possibly on another loop, starts from scratch
+    _playwright_lock = _playwright_loop = None
+
 
 class PersistentBrowser:
     """
     Manages a persistent browser instance to avoid startup delays.
     """
     
-    def __init__(self):
+    __slots__ = ("playwright", "browser", "owns_browser", "context", "page", "is_running", "last_used")
+    
+    def __init__(self, browser: Optional[Browser] = None):
         self.playwright = None
-        self.browser: Optional[Browser] = None
+        # A browser passed in is shared (owned by BrowserManager); only our context is ours to close
+        self.browser: Optional[Browser] = browser
+        self.owns_browser = browser is None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
         self.is_running = False
         self.last_used = None
-        
-        # Browser configuration - ULTRA-FAST MODE
-        self.browser_config = {
-            'headless': False,  # Run in background for maximum performance
-            'args': [
-                '--no-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-gpu',
-                '--no-first-run',
-                '--no-default-browser-check',
-                '--disable-background-timer-throttling',
-                '--disable-backgrounding-occluded_windows',
-                '--disable-renderer-backgrounding',
-                '--disable-plugins',
-                '--disable-extensions',
-                '--disable-web-security',
-                '--disable-features=VizDisplayCompositor',
-                '--disable-background-networking',
-                '--disable-default-apps',
-                '--disable-sync',
-                '--metrics-recording-only',
-                '--no-report-upload',
-                '--disable-hang-monitor',
-                '--disable-prompt-on-repost',
-                '--disable-client-side-phishing-detection',
-                '--disable-component-update',
-                '--disable-domain-reliability',
-                '--disable-dev-tools',
-                '--disable-logging',
-                '--disable-ipc-flooding-protection',
-                # ULTRA-FAST additions (keep essential functionality)
-                '--disable-images',
-                '--disable-animations',
-                '--disable-video',
-                '--disable-audio',
-                '--disable-webgl',
-                '--disable-canvas-aa',
-                '--disable-2d-canvas-clip-aa',
-                '--disable-gl-drawing-for-tests',
-                '--disable-accelerated-2d-canvas',
-                '--disable-accelerated-jpeg-decoding',
-                '--disable-accelerated-mjpeg-decode',
-                '--disable-accelerated-video-decode',
-                '--disable-gpu-rasterization',
-                '--disable-software-rasterizer',
-                '--disable-threaded-animation',
-                '--disable-threaded-scrolling',
-                '--disable-checker-imaging',
-                '--disable-new-content-rendering-timeout',
-                '--disable-hw-acceleration',
-                '--disable-smooth-scrolling',
-                '--disable-per-tab-renderer',
-                '--disable-background-mode',
-                '--disable-low-res-tiling',
-                '--disable-composited-antialiasing',
-                '--disable-partial-raster',
-                '--disable-zero-copy',
-                '--disable-gpu-memory-buffer-video-frames',
-                '--disable-gpu-memory-buffer-compositor-resources',
-                '--disable-gpu-memory-buffer-uma',
-                '--disable-gpu-memory-buffer-usage-histogram'
-            ]
-        }
     
     async def start_browser(self) -> bool:
         """
@@ -94,34 +193,26 @@ class PersistentBrowser:
         """
         try:
             if self.is_running and self.browser and self.context and self.page:
-                print("[BROWSER] Browser already running, reusing existing instance")
+                log.debug("[BROWSER] Browser already running, reusing existing instance")
                 return True
             
-            print("[BROWSER] Starting persistent browser...")
-            
-            # Start Playwright
-            print("[BROWSER] Starting Playwright...")
-            self.playwright = await async_playwright().start()
-            print("[BROWSER] Playwright started successfully")
+            log.debug("[BROWSER] Starting persistent browser...")
             
-            # Launch browser
-            print("[BROWSER] Launching Chromium browser...")
-            self.browser = await self.playwright.chromium.launch(**self.browser_config)
-            print("[BROWSER] Chromium browser launched successfully")
+            if self.owns_browser:
+                self.playwright = await get_playwright()
+                
+                # Launch browser
+                log.debug("[BROWSER] Launching Chromium browser...")
+                self.browser = await self.playwright.chromium.launch(**BROWSER_CONFIG)
+                log.debug("[BROWSER] Chromium browser launched successfully")
+            else:
+                log.debug("[BROWSER] Using shared Chromium browser")
             
             # Create context - ULTRA-FAST MODE
-            print("[BROWSER] Creating ULTRA-FAST browser context...")
+            log.debug("[BROWSER] Creating ULTRA-FAST browser context...")
             self.context = await self.browser.new_context(
                 user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                extra_http_headers={
-                    "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                    "accept-language": "en-US,en;q=0.5",
-                    "accept-encoding": "gzip, deflate",
-                    "cache-control": "no-cache",
-                    "pragma": "no-cache",
-                    "connection": "keep-alive",
-                    "upgrade-insecure-requests": "1"
-                },
+                extra_http_headers=_EXTRA_HEADERS,
                 viewport={'width': 800, 'height': 600},  # Smaller viewport for speed
                 ignore_https_errors=True,
                 bypass_csp=True,
@@ -131,63 +222,23 @@ class PersistentBrowser:
                 locale='en-US',
                 timezone_id='UTC'
             )
-            print("[BROWSER] Browser context created successfully")
+            log.debug("[BROWSER] Browser context created successfully")
+            
+            # Block static assets and install the init script once for every page in this context
+            await self.context.route("**/*", _route_handler)
+            await self.context.add_init_script(_INIT_SCRIPT)
             
             # Create page
-            print("[BROWSER] Creating browser page...")
+            log.debug("[BROWSER] Creating browser page...")
             self.page = await self.context.new_page()
-            print("[BROWSER] Browser page created successfully")
-            
-            # Set page options for ULTRA-FAST loading
-            print("[BROWSER] Configuring ULTRA-FAST page optimizations...")
-            await self.page.set_extra_http_headers({
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1'
-            })
-            
-            # Allow essential resources for proper page rendering (fully permissive for Orbit compatibility)
-            await self.page.route("**/*", lambda route: route.abort() if route.request.resource_type in ["image", "media"] else route.continue_())
-            
-            # Add ULTRA-FAST page optimizations
-            await self.page.add_init_script("""
-                // ULTRA-FAST MODE - Disable everything
-                console.log = () => {};
-                console.warn = () => {};
-                console.error = () => {};
-                
-                // Disable all animations and transitions
-                if (document.body) {
-                    document.body.style.setProperty('animation', 'none', 'important');
-                    document.body.style.setProperty('transition', 'none', 'important');
-                    document.body.style.setProperty('transform', 'none', 'important');
-                }
-                
-                // Disable all event listeners
-                const originalAddEventListener = EventTarget.prototype.addEventListener;
-                EventTarget.prototype.addEventListener = function(type, listener, options) {
-                    if (['mouseover', 'mouseout', 'mousemove', 'scroll', 'resize', 'animation', 'transition'].includes(type)) {
-                        return;
-                    }
-                    return originalAddEventListener.call(this, type, listener, options);
-                };
-                
-                // Disable CSS animations
-                const style = document.createElement('style');
-                style.textContent = '* { animation: none !important; transition: none !important; transform: none !important; }';
-                document.head.appendChild(style);
-            """)
+            log.debug("[BROWSER] Browser page created successfully")
             
             self.is_running = True
-            print("[BROWSER] ✅ Browser started successfully")
+            log.info("[BROWSER] ✅ Browser started successfully")
             return True
             
         except Exception as e:
-            print(f"[BROWSER] ❌ Error starting browser: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("[BROWSER] ❌ Error starting browser: %s", e)
             await self.cleanup()
             return False
     
@@ -201,40 +252,41 @@ class PersistentBrowser:
         try:
             # If browser is not running, start it
             if not self.is_running or not self.browser or not self.context or not self.page:
-                print("[BROWSER] Browser not running, starting...")
+                log.info("[BROWSER] Browser not running, starting...")
                 if not await self.start_browser():
                     return None
             
-            # Check if page is still responsive
-            try:
-                # Simple health check - just check if page exists and is not closed
-                if self.page and not self.page.is_closed():
-                    # Try a simple evaluation to see if page is responsive
-                    try:
-                        await self.page.evaluate("() => document.readyState", timeout=2000)
-                        print("[BROWSER] ✅ Page is healthy and responsive")
-                        return self.page
-                    except Exception as eval_error:
-                        print(f"[BROWSER] Page evaluation failed: {eval_error}")
-                        # Page might be unresponsive, create new one
-                        await self.create_new_page()
-                        return self.page
-                else:
-                    print("[BROWSER] Page is closed, creating new page...")
-                    await self.create_new_page()
-                    return self.page
-                    
-            except Exception as e:
-                print(f"[BROWSER] Page health check failed: {e}, creating new page...")
-                await self.create_new_page()
+            # Cheap liveness check; a hung page surfaces as an error on the next goto
+            if not self.page.is_closed():
                 return self.page
-                
+            
+            log.warning("[BROWSER] Page is closed, creating new page...")
+            await self.create_new_page()
+            return self.page
+            
         except Exception as e:
-            print(f"[BROWSER] Error getting page: {e}")
+            log.error("[BROWSER] Error getting page: %s", e)
             # Try to restart the browser completely
             await self.restart_browser()
             return self.page
     
+    async def goto(self, url: str, timeout: int = 15000):
+        """
+        Navigate the persistent page, returning once the HTML is parsed.
+        
+        Every scraper navigates through here. The init script disables the
+        page's animations and listeners, and blocked assets never load, so
+        waiting for "load" or "networkidle" gains nothing and can hang.
+        
+        Args:
+            url: Page to open
+            timeout: Navigation timeout in milliseconds
+            
+        Returns:
+            The main resource response, or None
+        """
+        return await self.page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+    
     async def create_new_page(self) -> bool:
         """
         Create a new page in the existing browser context.
@@ -244,7 +296,7 @@ class PersistentBrowser:
         """
         try:
             if not self.context:
-                print("[BROWSER] ❌ No browser context available")
+                log.error("[BROWSER] ❌ No browser context available")
                 return False
             
             # Close old page if it exists
@@ -255,58 +307,14 @@ class PersistentBrowser:
                     pass
                 self.page = None
             
-            # Wait a bit before creating new page
-            await asyncio.sleep(0.5)  # Reduced wait time for speed
-            
-            # Create new page
+            # Create new page (headers, routing and init script come from the context)
             self.page = await self.context.new_page()
             
-            # Set page options for ULTRA-FAST loading
-            await self.page.set_extra_http_headers({
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1'
-            })
-            
-            # Allow essential resources for proper page rendering (fully permissive for Orbit compatibility)
-            await self.page.route("**/*", lambda route: route.abort() if route.request.resource_type in ["image", "media"] else route.continue_())
-            
-            # Add ULTRA-FAST page optimizations
-            await self.page.add_init_script("""
-                // ULTRA-FAST MODE - Disable everything
-                console.log = () => {};
-                console.warn = () => {};
-                console.error = () => {};
-                
-                // Disable all animations and transitions
-                if (document.body) {
-                    document.body.style.setProperty('animation', 'none', 'important');
-                    document.body.style.setProperty('transition', 'none', 'important');
-                    document.body.style.setProperty('transform', 'none', 'important');
-                }
-                
-                // Disable all event listeners
-                const originalAddEventListener = EventTarget.prototype.addEventListener;
-                EventTarget.prototype.addEventListener = function(type, listener, options) {
-                    if (['mouseover', 'mouseout', 'mousemove', 'scroll', 'resize', 'animation', 'transition'].includes(type)) {
-                        return;
-                    }
-                    return originalAddEventListener.call(this, type, listener, options);
-                };
-                
-                // Disable CSS animations
-                const style = document.createElement('style');
-                style.textContent = '* { animation: none !important; transition: none !important; transform: none !important; }';
-                document.head.appendChild(style);
-            """)
-            
-            print("[BROWSER] ✅ New page created successfully")
+            log.info("[BROWSER] ✅ New page created successfully")
             return True
             
         except Exception as e:
-            print(f"[BROWSER] Error creating new page: {e}")
+            log.error("[BROWSER] Error creating new page: %s", e)
             return False
     
     async def restart_browser(self) -> bool:
@@ -317,12 +325,12 @@ class PersistentBrowser:
             True if successful, False otherwise
         """
         try:
-            print("[BROWSER] Restarting browser...")
+            log.warning("[BROWSER] Restarting browser...")
             await self.cleanup()
             return await self.start_browser()
             
         except Exception as e:
-            print(f"[BROWSER] Error restarting browser: {e}")
+            log.error("[BROWSER] Error restarting browser: %s", e)
             return False
     
     async def cleanup(self):
@@ -342,50 +350,49 @@ class PersistentBrowser:
                     pass
                 self.context = None
             
-            if self.browser:
+            if self.browser and self.owns_browser:
                 try:
                     await self.browser.close()
                 except:
                     pass
                 self.browser = None
             
-            if self.playwright:
-                try:
-                    await self.playwright.stop()
-                except:
-                    pass
-                self.playwright = None
+            # The Playwright driver is shared; stop_playwright() shuts it down at exit
+            self.playwright = None
             
             self.is_running = False
-            print("[BROWSER] Cleanup completed")
+            log.debug("[BROWSER] Cleanup completed")
             
         except Exception as e:
-            print(f"[BROWSER] Error during cleanup: {e}")
+            log.error("[BROWSER] Error during cleanup: %s", e)
     
     async def health_check(self) -> bool:
         """
-        Check if the browser is healthy and responsive.
+        Check that the browser is connected and the page is open, without a CDP round trip.
+        
+        Returns:
+            True if healthy, False otherwise
+        """
+        if not self.is_running or not self.browser or not self.context or not self.page:
+            return False
+        return self.browser.is_connected() and not self.page.is_closed()
+    
+    async def deep_health_check(self) -> bool:
+        """
+        Check that the page actually responds by evaluating a script in it.
+        
+        Costs a CDP round trip (up to 3s), so use it for diagnostics or after a failure.
         
         Returns:
             True if healthy, False otherwise
         """
+        if not await self.health_check():
+            return False
         try:
-            if not self.is_running or not self.browser or not self.context or not self.page:
-                return False
-            
-            # Check if page is closed
-            if self.page.is_closed():
-                return False
-            
-            # Try to evaluate a simple JavaScript expression with timeout
-            try:
-                await self.page.evaluate("() => document.readyState", timeout=3000)
-                return True
-            except:
-                return False
-                
+            await self.page.evaluate("() => document.readyState", timeout=3000)
+            return True
         except Exception as e:
-            print(f"[BROWSER] Health check failed: {e}")
+            log.warning("[BROWSER] Deep health check failed: %s", e)
             return False
     
     async def __aenter__(self):
@@ -400,12 +407,35 @@ class PersistentBrowser:
 
 class BrowserManager:
     """
-    Manages multiple browser instances for different sites.
+    Manages per-site browser contexts on a single shared Chromium instance.
     """
     
+    __slots__ = ("browsers", "max_browsers", "_browser", "_launch_lock")
+    
     def __init__(self):
         self.browsers: Dict[str, PersistentBrowser] = {}
-        self.max_browsers = 3  # Maximum number of concurrent browsers
+        self.max_browsers = 20  # Contexts are cheap; this only guards against runaway site lists
+        self._browser: Optional[Browser] = None
+        self._launch_lock = asyncio.Lock()
+    
+    async def _ensure_browser(self) -> Browser:
+        """Launch the shared Chromium on first use, or relaunch it if it has died."""
+        async with self._launch_lock:
+            if self._browser is None or not self._browser.is_connected():
+                playwright = await get_playwright()
+                log.debug("[BROWSER MANAGER] Launching shared Chromium browser...")
+                self._browser = await playwright.chromium.launch(**BROWSER_CONFIG)
+                log.info("[BROWSER MANAGER] Shared Chromium browser launched")
+            return self._browser
+    
+    async def _new_site_browser(self, site_name: str) -> Optional[PersistentBrowser]:
+        """Open a fresh context for a site on the shared browser."""
+        browser = PersistentBrowser(await self._ensure_browser())
+        if not await browser.start_browser():
+            log.error("[BROWSER MANAGER] Failed to start browser for %s", site_name)
+            return None
+        self.browsers[site_name] = browser
+        return browser
     
     async def get_browser(self, site_name: str) -> PersistentBrowser:
         """
@@ -422,49 +452,54 @@ class BrowserManager:
                 if len(self.browsers) >= self.max_browsers:
                     # Close oldest browser
                     oldest_site = next(iter(self.browsers))
-                    print(f"[BROWSER MANAGER] Closing oldest browser: {oldest_site}")
+                    log.info("[BROWSER MANAGER] Closing oldest browser: %s", oldest_site)
                     await self.browsers[oldest_site].cleanup()
                     del self.browsers[oldest_site]
                 
-                # Create new browser
-                print(f"[BROWSER MANAGER] Creating new browser for {site_name}")
-                self.browsers[site_name] = PersistentBrowser()
-                success = await self.browsers[site_name].start_browser()
-                if not success:
-                    print(f"[BROWSER MANAGER] Failed to start browser for {site_name}")
-                    return None
+                # Create new browser context
+                log.info("[BROWSER MANAGER] Creating new browser for %s", site_name)
+                return await self._new_site_browser(site_name)
             else:
                 # Check if existing browser is healthy
                 browser = self.browsers[site_name]
                 if not await browser.health_check():
-                    print(f"[BROWSER MANAGER] Browser for {site_name} is unhealthy, restarting...")
+                    log.warning("[BROWSER MANAGER] Browser for %s is unhealthy, restarting...", site_name)
                     await browser.cleanup()
-                    self.browsers[site_name] = PersistentBrowser()
-                    success = await self.browsers[site_name].start_browser()
-                    if not success:
-                        print(f"[BROWSER MANAGER] Failed to restart browser for {site_name}")
-                        return None
+                    del self.browsers[site_name]
+                    return await self._new_site_browser(site_name)
             
             return self.browsers[site_name]
         except Exception as e:
-            print(f"[BROWSER MANAGER] Error getting browser for {site_name}: {e}")
+            log.error("[BROWSER MANAGER] Error getting browser for %s: %s", site_name, e)
             return None
     
     async def cleanup_all(self):
-        """Clean up all browser instances."""
-        for site_name, browser in self.browsers.items():
-            try:
-                await browser.cleanup()
-            except Exception as e:
-                print(f"[BROWSER MANAGER] Error cleaning up {site_name}: {e}")
+        """Clean up all browser contexts and the shared browser."""
+        names = list(self.browsers)
+        results = await asyncio.gather(
+            *(self.browsers[name].cleanup() for name in names),
+            return_exceptions=True
+        )
+        for site_name, result in zip(names, results):
+            if isinstance(result, Exception):
+                log.error("[BROWSER MANAGER] Error cleaning up %s: %s", site_name, result)
         
         self.browsers.clear()
-        print("[BROWSER MANAGER] All browsers cleaned up")
+        
+        if self._browser:
+            try:
+                await self._browser.close()
+            except Exception as e:
+                log.error("[BROWSER MANAGER] Error closing shared browser: %s", e)
+            self._browser = None
+        await stop_playwright()
+        log.info("[BROWSER MANAGER] All browsers cleaned up")
     
     async def health_check_all(self) -> Dict[str, bool]:
-        """Check health of all browsers."""
-        health_status = {}
-        for site_name, browser in self.browsers.items():
-            health_status[site_name] = await browser.health_check()
-        
-        return health_status
+        """Check health of all browsers concurrently."""
+        names = list(self.browsers)
+        results = await asyncio.gather(
+            *(self.browsers[name].deep_health_check() for name in names),
+            return_exceptions=True
+        )
+        return {name: result is True for name, result in zip(names, results)}
\ No newline at end of file
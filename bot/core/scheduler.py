@@ -1,62 +1,38 @@
 from __future__ import annotations
-import os, asyncio, time
-from datetime import datetime
-
-from .dedupe import DedupeCache
-from .notify import send_telegram, format_arbitrage_results, broadcast_to_users
+import os, asyncio, logging, signal
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+import orjson
+
+from .dedupe import DedupeCache, DedupeKey
+from .notify import send_telegram, format_arbitrage_results, broadcast_to_users, queue_broadcast, close_client, reload_telegram_env, ts
 from .team_matcher import find_arbitrage_opportunities
 from .user_manager import UserManager
 from .persistent_browser import BrowserManager
+from ..sites.orbit import fetch_orbit_snapshots
+from ..sites.golbet import fetch_golbet724_snapshots
+
+log = logging.getLogger(__name__)
 
 # Configuration - ULTRA-FAST MODE
 SCAN_INTERVAL_SECONDS = float(os.getenv("SCAN_INTERVAL_SECONDS", "1.0"))  # Default to 1 second for ULTRA-FAST scanning
 ALERT_DEDUPE_MINUTES = int(os.getenv("ALERT_DEDUPE_MINUTES", "1"))  # Reduced dedupe time for speed
+MAX_BACKOFF_SECONDS = float(os.getenv("MAX_BACKOFF_SECONDS", "900"))  # Ceiling on the wait after repeated cycle errors
+EMPTY_COOLDOWN_SECONDS = float(os.getenv("EMPTY_COOLDOWN_SECONDS", "60"))  # Ceiling on the wait while a site returns no data
+MIN_SLEEP_SECONDS = 0.05  # Always pause this long between cycles so bot polling and sends get loop time
 
-# Import scrapers at function level to avoid circular imports
+# User-facing status messages, filled in with str.format only when sent
+_NO_DATA_TMPL = """⚠️ <b>DATA COLLECTION ISSUE</b> ⚠️
 
-
-async def run_cycle(dedupe: DedupeCache, user_manager: UserManager, telegram_bot=None, browser_manager: BrowserManager = None):
-    """
-    Run one cycle of arbitrage detection with fast scanning.
-    
-    Args:
-        dedupe: DedupeCache instance for preventing duplicate alerts
-        user_manager: UserManager instance for user management
-        telegram_bot: Optional TelegramBot instance for sending results
-        browser_manager: BrowserManager instance for persistent browsers
-    """
-    try:
-        print(f"[SCHEDULER] Starting new cycle (Interval: {SCAN_INTERVAL_SECONDS}s)...")
-        registered_users = user_manager.get_registered_users()
-        user_count = len(registered_users)
-        if user_count == 0:
-            print("[SCHEDULER] No registered users, skipping cycle")
-            return
-        
-        print(f"[SCHEDULER] {user_count} registered users, proceeding with cycle")
-        
-        # Fetch data from both sites using persistent browsers
-        print("[SCHEDULER] Fetching data from Orbit...")
-        from ..sites.orbit import fetch_orbit_snapshots
-        orbitData = await fetch_orbit_snapshots(browser_manager)
-        print(f"[SCHEDULER] Orbit data: {len(orbitData)} matches")
-        
-        print("[SCHEDULER] Fetching data from Golbet...")
-        from ..sites.golbet import fetch_golbet724_snapshots
-        golbetData = await fetch_golbet724_snapshots(browser_manager)
-        print(f"[SCHEDULER] Golbet data: {len(golbetData)} matches")
-        
-        # Check if we have sufficient data
-        if len(orbitData) == 0 or len(golbetData) == 0:
-            error_msg = f"""⚠️ <b>DATA COLLECTION ISSUE</b> ⚠️
-
-⏰ <b>Time:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-👥 <b>Recipients:</b> {len(registered_users)} registered users
+⏰ <b>Time:</b> {time}
+👥 <b>Recipients:</b> {users} registered users
 
 🚨 <b>Issue Detected:</b>
    • Insufficient data received from betting sites
-   • Orbit data: {len(orbitData)} matches
-   • Golbet data: {len(golbetData)} matches
+   • Orbit data: {orbit_count} matches
+   • Golbet data: {golbet_count} matches
 
 🔍 <b>Possible Causes:</b>
    • Website structure changes
@@ -65,7 +41,7 @@ async def run_cycle(dedupe: DedupeCache, user_manager: UserManager, telegram_bot
    • Scraper configuration issues
 
 💡 <b>What Happens Next:</b>
-   • Bot will retry in next cycle ({SCAN_INTERVAL_SECONDS} seconds)
+   • Bot will retry in next cycle ({interval} seconds)
    • Continuous monitoring remains active
    • Alerts will resume when data is available
 
@@ -75,48 +51,11 @@ async def run_cycle(dedupe: DedupeCache, user_manager: UserManager, telegram_bot
    • Monitoring: Active and alerting
 
 🎯 <b>Stay tuned - normal operations will resume shortly!</b> 🔄"""
-            
-            if telegram_bot:
-                await telegram_bot.broadcast_to_users(error_msg)
-            else:
-                await broadcast_to_users(error_msg, registered_users)
-            return
-        
-        # Compare data using Python-based matching (no OpenAI)
-        print("[SCHEDULER] Comparing data using Python team matching...")
-        result = find_arbitrage_opportunities(orbitData, golbetData)
-        
-        if result:
-            print(f"[SCHEDULER] Arbitrage opportunities found: {len(result)}")
-            
-            try:
-                # Format the opportunities result
-                msg = format_arbitrage_results(result, orbitData, golbetData)
-                
-                # Send to users via Telegram bot if available, otherwise use direct broadcast
-                if telegram_bot:
-                    await telegram_bot.send_arbitrage_results(msg)
-                else:
-                    await broadcast_to_users(msg, registered_users)
-                
-                # Update user activity
-                for user_id in registered_users:
-                    user_manager.update_user_activity(user_id)
-                    
-            except Exception as e:
-                print(f"[SCHEDULER] Error formatting opportunities result: {e}")
-                # Fallback: send raw result
-                fallback_msg = f"🎯 <b>ARBITRAGE OPPORTUNITIES FOUND!</b> 🎯\n\n{result}"
-                if telegram_bot:
-                    await telegram_bot.send_arbitrage_results(fallback_msg)
-                else:
-                    await broadcast_to_users(fallback_msg, registered_users)
-        else:
-            print("[SCHEDULER] No arbitrage opportunities found")
-            no_opportunities_msg = f"""🔍 <b>ARBITRAGE SCAN COMPLETED</b> 🔍
 
-⏰ <b>Scan Time:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-👥 <b>Recipients:</b> {len(registered_users)} registered users
+_NO_OPPORTUNITIES_TMPL = """🔍 <b>ARBITRAGE SCAN COMPLETED</b> 🔍
+
+⏰ <b>Scan Time:</b> {time}
+👥 <b>Recipients:</b> {users} registered users
 
 📊 <b>Scan Results:</b>
    • ✅ <b>Data Collection:</b> Successful
@@ -135,7 +74,7 @@ async def run_cycle(dedupe: DedupeCache, user_manager: UserManager, telegram_bot
    • Stay patient and keep monitoring
 
 🔄 <b>Next Actions:</b>
-   • <b>Next Scan:</b> In {SCAN_INTERVAL_SECONDS} seconds
+   • <b>Next Scan:</b> In {interval} seconds
    • <b>Continuous Monitoring:</b> Active
    • <b>Real-time Alerts:</b> Ready
 
@@ -145,24 +84,15 @@ async def run_cycle(dedupe: DedupeCache, user_manager: UserManager, telegram_bot
    • Quality over quantity - we only want profitable opportunities
 
 🎯 <b>Keep monitoring - your next big opportunity is coming!</b> 💰🚀"""
-            
-            if telegram_bot:
-                await telegram_bot.send_no_opportunities_message()
-            else:
-                await broadcast_to_users(no_opportunities_msg, registered_users)
-        
-        print("[SCHEDULER] Cycle completed successfully")
-        
-    except Exception as e:
-        print(f"[SCHEDULER] Error in cycle: {e}")
-        error_msg = f"""🚨 <b>SCHEDULER ERROR</b> 🚨
 
-⏰ <b>Time:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-👥 <b>Recipients:</b> {len(registered_users)} registered users
+_CYCLE_ERROR_TMPL = """🚨 <b>SCHEDULER ERROR</b> 🚨
+
+⏰ <b>Time:</b> {time}
+👥 <b>Recipients:</b> {users} registered users
 
 ❌ <b>Error Details:</b>
    • <b>Type:</b> Cycle execution error
-   • <b>Message:</b> {str(e)}
+   • <b>Message:</b> {error}
    • <b>Status:</b> Investigation required
 
 🔍 <b>What Happened:</b>
@@ -181,78 +111,15 @@ async def run_cycle(dedupe: DedupeCache, user_manager: UserManager, telegram_bot
    • Next cycle scheduled normally
 
 🎯 <b>Don't worry - the bot is designed to handle errors gracefully!</b> 🔄"""
-        
-        if telegram_bot:
-            await telegram_bot.broadcast_to_users(error_msg)
-        else:
-            registered_users = user_manager.get_registered_users()
-            if registered_users:
-                await broadcast_to_users(error_msg, registered_users)
-
 
-async def scheduler(telegram_bot=None):
-    """
-    Main scheduler function that runs fast arbitrage detection cycles.
-    
-    Args:
-        telegram_bot: Optional TelegramBot instance for sending results
-    """
-    print(f"[SCHEDULER] Starting FAST arbitrage detection scheduler...")
-    print(f"[SCHEDULER] Scan interval: {SCAN_INTERVAL_SECONDS} seconds")
-    
-    # Initialize components
-    dedupe = DedupeCache()
-    user_manager = UserManager()
-    browser_manager = BrowserManager()
-    
-    print(f"[SCHEDULER] Initialized with {user_manager.get_user_count()} registered users")
-    print("[SCHEDULER] Starting persistent browsers...")
-    
-    try:
-        # Start browsers for both sites
-        print("[SCHEDULER] Starting persistent browsers...")
-        
-        # Start browsers in parallel for faster initialization
-        orbit_browser, golbet_browser = await asyncio.gather(
-            browser_manager.get_browser('orbit'),
-            browser_manager.get_browser('golbet'),
-            return_exceptions=True
-        )
-        
-        # Check for exceptions
-        if isinstance(orbit_browser, Exception):
-            print(f"[SCHEDULER] ❌ Orbit browser failed: {orbit_browser}")
-            orbit_browser = None
-        if isinstance(golbet_browser, Exception):
-            print(f"[SCHEDULER] ❌ Golbet browser failed: {golbet_browser}")
-            golbet_browser = None
-        
-        if not orbit_browser or not golbet_browser:
-            print("[SCHEDULER] ❌ Failed to start persistent browsers")
-            raise Exception("Persistent browser initialization failed")
-            
-        print("[SCHEDULER] ✅ Persistent browsers started successfully")
-        
-        while True:
-            # Run one cycle
-            await run_cycle(dedupe, user_manager, telegram_bot, browser_manager)
-            
-            # Sleep for the configured interval (much faster now)
-            print(f"[SCHEDULER] Cycle completed, sleeping for {SCAN_INTERVAL_SECONDS:.2f}s")
-            await asyncio.sleep(SCAN_INTERVAL_SECONDS)
-            
-    except Exception as e:
-        print(f"[SCHEDULER] Top-level error: {e}")
-        # Try to notify users about the error
-        if telegram_bot:
-            await telegram_bot.broadcast_to_users(f"""🚨 <b>CRITICAL SCHEDULER ERROR</b> 🚨
+_CRITICAL_ERROR_TMPL = """🚨 <b>CRITICAL SCHEDULER ERROR</b> 🚨
 
-⏰ <b>Time:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+⏰ <b>Time:</b> {time}
 👥 <b>Recipients:</b> All registered users
 
 ❌ <b>Critical Issue:</b>
    • <b>Type:</b> Scheduler crash
-   • <b>Message:</b> {str(e)}
+   • <b>Message:</b> {error}
    • <b>Status:</b> System restart required
 
 🚨 <b>What Happened:</b>
@@ -272,43 +139,294 @@ async def scheduler(telegram_bot=None):
 
 🎯 <b>Stay calm - the bot is designed to recover automatically!</b> 🔄
 
-⚠️ <b>Note:</b> This is a rare occurrence. The bot will be back online shortly.""")
-        else:
-            registered_users = user_manager.get_registered_users()
-            if registered_users:
-                await broadcast_to_users(f"""🚨 <b>CRITICAL SCHEDULER ERROR</b> 🚨
+⚠️ <b>Note:</b> This is a rare occurrence. The bot will be back online shortly."""
 
-⏰ <b>Time:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-👥 <b>Recipients:</b> All registered users
+# Serialized (orbit, golbet) input of the last match pass and its result
+_last_match: Tuple[Optional[bytes], List[Dict]] = (None, [])
 
-❌ <b>Critical Issue:</b>
-   • <b>Type:</b> Scheduler crash
-   • <b>Message:</b> {str(e)}
-   • <b>Status:</b> System restart required
+# Team matching is CPU-bound; a worker process keeps it off the event loop
+_match_pool: Optional[ProcessPoolExecutor] = None
 
-🚨 <b>What Happened:</b>
-   • A critical error caused the scheduler to crash
-   • Arbitrage detection has stopped
-   • Immediate attention is required
 
-💡 <b>What Happens Next:</b>
-   • Bot will attempt to restart automatically
-   • All systems will be reinitialized
-   • Monitoring will resume after restart
+def _get_match_pool() -> ProcessPoolExecutor:
+    """Return the matching worker pool, starting it on first use."""
+    global _match_pool
+    if _match_pool is None:
+        # Spawn, not fork: this process has a running loop, threads and signal handlers
+        _match_pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    return _match_pool
 
-🛠️ <b>Technical Response:</b>
-   • Error logged with full details
-   • Automatic restart initiated
-   • Recovery procedures activated
 
-🎯 <b>Stay calm - the bot is designed to recover automatically!</b> 🔄
+def _shutdown_match_pool() -> None:
+    """Stop the matching worker process, if one was started."""
+    global _match_pool
+    if _match_pool is not None:
+        _match_pool.shutdown(cancel_futures=True)
+        _match_pool = None
+
+
+async def _match_opportunities(orbit_data: List, golbet_data: List) -> List[Dict]:
+    """Run find_arbitrage_opportunities, reusing the last result while both sites' data is unchanged."""
+    global _last_match, _match_pool
+    key = orjson.dumps([orbit_data, golbet_data])
+    if key == _last_match[0]:
+        log.debug("[SCHEDULER] Site data unchanged since last cycle, reusing match result")
+        # Same opportunities, but detected now: a repeat alert must not carry the old time
+        now_str = ts()
+        return [{**opp, "detection_time": now_str} for opp in _last_match[1]]
+    loop = asyncio.get_running_loop()
+    try:
+        result = await loop.run_in_executor(
+            _get_match_pool(), find_arbitrage_opportunities, orbit_data, golbet_data
+        )
+    except BrokenProcessPool:
+        # The worker died; replace the pool once rather than failing every later cycle
+        log.warning("[SCHEDULER] Matching worker died, restarting it")
+        if _match_pool is not None:
+            _match_pool.shutdown(wait=False)
+        _match_pool = None
+        result = await loop.run_in_executor(
+            _get_match_pool(), find_arbitrage_opportunities, orbit_data, golbet_data
+        )
+    _last_match = (key, result)
+    return result
+
 
-⚠️ <b>Note:</b> This is a rare occurrence. The bot will be back online shortly.""", registered_users)
+def _dedupe_key(opportunity: Dict) -> DedupeKey:
+    """Dedupe key for an opportunity; find_arbitrage_opportunities only reports home-win ('1') odds."""
+    return (opportunity.get("match_name", ""), opportunity.get("market_type", ""), "1")
+
+
+async def run_cycle(dedupe: DedupeCache, user_manager: UserManager, telegram_bot=None, browser_manager: BrowserManager = None) -> str:
+    """
+    Run one cycle of arbitrage detection with fast scanning.
+    
+    Args:
+        dedupe: DedupeCache instance for preventing duplicate alerts
+        user_manager: UserManager instance for user management
+        telegram_bot: Optional TelegramBot instance for sending results
+        browser_manager: BrowserManager instance for persistent browsers
+        
+    Returns:
+        "error" if the cycle hit an error, "empty" if a site returned no data, "ok" otherwise
+    """
+    # Snapshot once per cycle; the error handler below reuses it
+    registered_users: tuple = ()
+    try:
+        log.debug("[SCHEDULER] Starting new cycle (Interval: %ss)...", SCAN_INTERVAL_SECONDS)
+        registered_users = tuple(user_manager.get_registered_users())
+        user_count = len(registered_users)
+        if user_count == 0:
+            log.debug("[SCHEDULER] No registered users, skipping cycle")
+            return "ok"
+        
+        log.debug("[SCHEDULER] %d registered users, proceeding with cycle", user_count)
+        
+        # Fetch data from both sites concurrently using persistent browsers
+        log.debug("[SCHEDULER] Fetching data from Orbit and Golbet...")
+        orbitData, golbetData = await asyncio.gather(
+            fetch_orbit_snapshots(browser_manager),
+            fetch_golbet724_snapshots(browser_manager),
+            return_exceptions=True
+        )
+        
+        # One site failing shouldn't kill the cycle; treat it as no data
+        if isinstance(orbitData, Exception):
+            log.error("[SCHEDULER] ❌ Orbit fetch failed: %s", orbitData)
+            orbitData = []
+        if isinstance(golbetData, Exception):
+            log.error("[SCHEDULER] ❌ Golbet fetch failed: %s", golbetData)
+            golbetData = []
+        log.debug("[SCHEDULER] Orbit data: %d matches", len(orbitData))
+        log.debug("[SCHEDULER] Golbet data: %d matches", len(golbetData))
+        
+        # Check if we have sufficient data
+        if len(orbitData) == 0 or len(golbetData) == 0:
+            error_msg = _NO_DATA_TMPL.format(
+                time=ts(), users=user_count, orbit_count=len(orbitData),
+                golbet_count=len(golbetData), interval=SCAN_INTERVAL_SECONDS
+            )
+            
+            # TelegramBot personalizes each copy and sends it itself; the direct broadcast
+            # is queued instead, so the next scan needn't wait on it
+            if telegram_bot:
+                await telegram_bot.broadcast_to_users(error_msg)
+            else:
+                queue_broadcast(error_msg, registered_users)
+            return "empty"
+        
+        # Compare data using Python-based matching (no OpenAI)
+        log.debug("[SCHEDULER] Comparing data using Python team matching...")
+        result = await _match_opportunities(orbitData, golbetData)
+        
+        if result:
+            log.info("[SCHEDULER] Arbitrage opportunities found: %d", len(result))
+            
+            # Only alert on opportunities not already sent within the dedupe window;
+            # check_and_mark claims each key in one lookup, and claims are released below
+            # unless the alert is delivered
+            fresh, fresh_keys = [], []
+            for opp in result:
+                key = _dedupe_key(opp)
+                if dedupe.check_and_mark(key):
+                    fresh.append(opp)
+                    fresh_keys.append(key)
+            
+            if not fresh:
+                log.info("[SCHEDULER] All %d opportunities were alerted recently, skipping broadcast", len(result))
+            else:
+                delivered = 0
+                try:
+                    # Format the opportunities result
+                    msg = format_arbitrage_results(fresh, orbitData, golbetData)
+                    # Scraped data isn't needed past this point; free it before the slow sends
+                    orbitData = golbetData = None
+                    
+                    # Send to users via Telegram bot if available, otherwise use direct broadcast
+                    if telegram_bot:
+                        delivered = await telegram_bot.send_arbitrage_results(msg)
+                    else:
+                        delivered = await broadcast_to_users(msg, registered_users)
+                    
+                    # Update user activity
+                    user_manager.update_users_activity(registered_users)
+                        
+                except Exception as e:
+                    log.error("[SCHEDULER] Error formatting opportunities result: %s", e)
+                    # Fallback: send raw result; the keys are released so a proper alert goes out next cycle
+                    fallback_msg = f"🎯 <b>ARBITRAGE OPPORTUNITIES FOUND!</b> 🎯\n\n{fresh}"
+                    if telegram_bot:
+                        await telegram_bot.send_arbitrage_results(fallback_msg)
+                    else:
+                        await broadcast_to_users(fallback_msg, registered_users)
+                finally:
+                    # Keep the claims only if the formatted alert reached someone
+                    if delivered:
+                        dedupe.save()
+                    else:
+                        log.warning("[SCHEDULER] Alert for %d opportunities was not delivered, will retry next cycle", len(fresh))
+                        for key in fresh_keys:
+                            dedupe.unmark(key)
+        else:
+            log.info("[SCHEDULER] No arbitrage opportunities found")
+            orbitData = golbetData = None
+            
+            # TelegramBot renders its own copy, so only build ours for the direct broadcast
+            if telegram_bot:
+                await telegram_bot.send_no_opportunities_message()
+            else:
+                no_opportunities_msg = _NO_OPPORTUNITIES_TMPL.format(
+                    time=ts(), users=user_count, interval=SCAN_INTERVAL_SECONDS
+                )
+                queue_broadcast(no_opportunities_msg, registered_users)
+        
+        log.debug("[SCHEDULER] Cycle completed successfully")
+        return "ok"
+        
+    except Exception as e:
+        log.exception("[SCHEDULER] Error in cycle: %s", e)
+        error_msg = _CYCLE_ERROR_TMPL.format(time=ts(), users=len(registered_users), error=e)
+        
+        if telegram_bot:
+            await telegram_bot.broadcast_to_users(error_msg)
+        elif registered_users:
+            queue_broadcast(error_msg, registered_users)
+        return "error"
+
+
+async def scheduler(telegram_bot=None):
+    """
+    Main scheduler function that runs fast arbitrage detection cycles.
+    
+    Args:
+        telegram_bot: Optional TelegramBot instance for sending results
+    """
+    log.info("[SCHEDULER] Starting FAST arbitrage detection scheduler...")
+    log.info("[SCHEDULER] Scan interval: %s seconds", SCAN_INTERVAL_SECONDS)
+    
+    # Initialize components
+    dedupe = DedupeCache(window_seconds=ALERT_DEDUPE_MINUTES * 60, storage_file="dedupe.json")
+    user_manager = UserManager()
+    browser_manager = BrowserManager()
+    
+    log.info("[SCHEDULER] Initialized with %s registered users", user_manager.get_user_count())
+    
+    # Re-read Telegram settings on SIGHUP (signal handlers are unavailable on Windows)
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, reload_telegram_env)
+    except (NotImplementedError, AttributeError):
+        pass
+    log.debug("[SCHEDULER] Starting persistent browsers...")
+    
+    try:
+        # Start browsers for both sites
+        # Start browsers in parallel; give up as soon as either fails instead of waiting on the other
+        startups = {
+            asyncio.create_task(browser_manager.get_browser('orbit')): "Orbit",
+            asyncio.create_task(browser_manager.get_browser('golbet')): "Golbet",
+        }
+        pending = set(startups)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                # get_browser reports most failures by returning None rather than raising
+                failure = task.exception() or (None if task.result() else "no browser returned")
+                if failure:
+                    log.error("[SCHEDULER] ❌ %s browser failed: %s", startups[task], failure)
+                    for other in pending:
+                        other.cancel()
+                    log.error("[SCHEDULER] ❌ Failed to start persistent browsers")
+                    raise Exception("Persistent browser initialization failed")
+            
+        log.info("[SCHEDULER] ✅ Persistent browsers started successfully")
+        
+        # Cycles start on a fixed monotonic cadence rather than interval-after-finish
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        fails = 0
+        empty_cycles = 0
+        while True:
+            # Run one cycle
+            status = await run_cycle(dedupe, user_manager, telegram_bot, browser_manager)
+            
+            now = loop.time()
+            if status == "ok":
+                fails = empty_cycles = 0
+                # Sleep until the next tick; if the cycle overran, start the next one after a short pause
+                next_tick = max(next_tick + SCAN_INTERVAL_SECONDS, now + MIN_SLEEP_SECONDS)
+            elif status == "empty":
+                # A site is returning nothing; cool down rather than rescrape at full speed
+                empty_cycles = min(empty_cycles + 1, 6)
+                cooldown = min(SCAN_INTERVAL_SECONDS * 2 ** empty_cycles, EMPTY_COOLDOWN_SECONDS)
+                log.warning("[SCHEDULER] %d empty cycle(s) in a row, cooling down for %.2fs", empty_cycles, cooldown)
+                next_tick = now + cooldown
+            else:
+                # Back off exponentially while cycles keep failing
+                fails = min(fails + 1, 6)
+                backoff = min(SCAN_INTERVAL_SECONDS * 2 ** fails, MAX_BACKOFF_SECONDS)
+                log.warning("[SCHEDULER] %d failed cycle(s) in a row, backing off for %.2fs", fails, backoff)
+                next_tick = now + backoff
+            log.debug("[SCHEDULER] Cycle completed, sleeping for %.2fs", next_tick - now)
+            await asyncio.sleep(next_tick - now)
+            
+    except Exception as e:
+        log.exception("[SCHEDULER] Top-level error: %s", e)
+        # Try to notify users about the error
+        # Awaited, not queued: shutdown follows and close_client() drops anything still queued
+        critical_msg = _CRITICAL_ERROR_TMPL.format(time=ts(), error=e)
+        if telegram_bot:
+            await telegram_bot.broadcast_to_users(critical_msg)
+        else:
+            registered_users = user_manager.get_registered_users()
+            if registered_users:
+                await broadcast_to_users(critical_msg, registered_users)
         
         # Wait before potentially restarting
         await asyncio.sleep(10)
     
     finally:
         # Clean up browsers
-        print("[SCHEDULER] Cleaning up persistent browsers...")
+        log.info("[SCHEDULER] Cleaning up persistent browsers...")
         await browser_manager.cleanup_all()
+        await close_client()
+        _shutdown_match_pool()
@@ -4,9 +4,23 @@ Team matching module for arbitrage detection.
 Replaces OpenAI with Python-based fuzzy string matching.
 """
 
+import html
 import re
-from typing import List, Dict, Tuple, Optional
-from datetime import datetime
+import sys
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Dict, Tuple, Optional, Iterator
+from .notify import ts
+
+# Precompiled patterns for team name normalization
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Distinct raw names whose normalization each TeamMatcher remembers
+NORMALIZE_CACHE_SIZE = 4096
+
+# Recent (orbit teams, golbet teams) inputs whose match results each TeamMatcher keeps
+MATCH_CACHE_SIZE = 16
 
 class TeamMatcher:
     """
@@ -16,7 +30,6 @@ class TeamMatcher:
     
     def __init__(self, match_threshold: int = 80):
         self.match_threshold = match_threshold
-        self.team_cache = {}  # Cache for team name mappings
         
         # Common team name variations and replacements
         self.team_replacements = {
@@ -86,6 +99,17 @@ class TeamMatcher:
             'cham': 'sc cham',
             'zug': 'fc zug 94'
         }
+        
+        # One scan tells whether any replacement can apply; most names skip the loop entirely
+        self._replacement_re = re.compile('|'.join(
+            re.escape(old) for old in sorted(self.team_replacements, key=len, reverse=True)
+        ))
+        
+        # Names repeat across every candidate comparison and every scan; normalize each once
+        self._normalize_cached = lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(self._normalize_uncached)
+        
+        # Fixtures rarely change between scans even when odds do; reuse the whole match pass
+        self._match_cache: OrderedDict[Tuple[Tuple[str, ...], Tuple[str, ...]], Dict[str, str]] = OrderedDict()
     
     def normalize_team_name(self, team_name: str) -> str:
         """
@@ -99,19 +123,24 @@ class TeamMatcher:
         """
         if not team_name:
             return ""
-        
+        return self._normalize_cached(team_name)
+    
+    def _normalize_uncached(self, team_name: str) -> str:
+        """normalize_team_name without the cache."""
         # Convert to lowercase and remove extra spaces
         normalized = team_name.lower().strip()
         
-        # Apply replacements
-        for old, new in self.team_replacements.items():
-            normalized = normalized.replace(old, new)
+        # Apply replacements in order (later keys see earlier output), only if one matches.
+        # Every chain starts from a key in the original string, so none matching means no change.
+        if self._replacement_re.search(normalized):
+            for old, new in self.team_replacements.items():
+                normalized = normalized.replace(old, new)
         
         # Remove special characters and extra spaces
-        normalized = re.sub(r'[^\w\s]', ' ', normalized)
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
+        normalized = _NON_WORD_RE.sub(' ', normalized)
+        normalized = _WHITESPACE_RE.sub(' ', normalized).strip()
         
-        return normalized
+        return sys.intern(normalized)
     
     def calculate_similarity(self, team1: str, team2: str) -> float:
         """
@@ -164,11 +193,43 @@ class TeamMatcher:
         if not candidate_teams:
             return "", 0.0
         
+        return self._best_prepared_match(target_team, self._prepare_candidates(candidate_teams))
+    
+    def _prepare_candidates(self, candidate_teams: List[str]) -> List[Tuple[str, str, frozenset]]:
+        """
+        Precompute (team, normalized name, word set) for each non-empty candidate.
+        
+        Empty names score 0 against everything, so they are dropped here.
+        """
+        prepared = []
+        for candidate in candidate_teams:
+            if candidate:
+                norm = self.normalize_team_name(candidate)
+                prepared.append((candidate, norm, frozenset(norm.split())))
+        return prepared
+    
+    def _best_prepared_match(self, target_team: str, candidates: List[Tuple[str, str, frozenset]]) -> Tuple[str, float]:
+        """
+        find_best_match over candidates from _prepare_candidates.
+        
+        Scores are identical to calculate_similarity, and ties keep the first candidate.
+        """
+        if not target_team:
+            return "", 0.0
+        norm = self.normalize_team_name(target_team)
+        words = frozenset(norm.split())
+        
         best_match = ""
         best_similarity = 0.0
         
-        for candidate in candidate_teams:
-            similarity = self.calculate_similarity(target_team, candidate)
+        for candidate, cand_norm, cand_words in candidates:
+            if norm == cand_norm:
+                similarity = 100.0
+            elif not words or not cand_words:
+                continue
+            else:
+                common = len(words & cand_words)
+                similarity = (common / (len(words) + len(cand_words) - common)) * 100
             if similarity > best_similarity:
                 best_similarity = similarity
                 best_match = candidate
@@ -186,13 +247,24 @@ class TeamMatcher:
         Returns:
             Dictionary mapping Orbit teams to Golbet teams
         """
+        # Keyed on the exact sequences: order decides ties and which duplicate wins
+        key = (tuple(orbit_teams), tuple(golbet_teams))
+        cached = self._match_cache.get(key)
+        if cached is not None:
+            self._match_cache.move_to_end(key)
+            print(f"[TEAM MATCHER] Reusing {len(cached)} matches from an earlier scan")
+            return dict(cached)
+        
         matches = {}
         
+        # Normalize and split every candidate once, not once per orbit team
+        candidates = self._prepare_candidates(golbet_teams)
+        
         for orbit_team in orbit_teams:
             if not orbit_team:
                 continue
             
-            best_match, similarity = self.find_best_match(orbit_team, golbet_teams)
+            best_match, similarity = self._best_prepared_match(orbit_team, candidates)
             
             if similarity >= self.match_threshold:
                 matches[orbit_team] = best_match
@@ -200,6 +272,10 @@ class TeamMatcher:
             else:
                 print(f"[TEAM MATCHER] ❌ {orbit_team} - No good match found (best: {similarity:.1f}%)")
         
+        self._match_cache[key] = dict(matches)
+        if len(self._match_cache) > MATCH_CACHE_SIZE:
+            self._match_cache.popitem(last=False)
+        
         return matches
 
 
@@ -242,8 +318,38 @@ class ArbitrageCalculator:
         Returns:
             True if within threshold, False otherwise
         """
-        _, percentage_diff = self.calculate_odds_difference(orbit_lay, golbet_back)
-        return self.min_threshold <= percentage_diff <= self.max_threshold
+        lo_factor, hi_factor = self._threshold_factors()
+        return self._within_threshold(orbit_lay, golbet_back, lo_factor, hi_factor)
+    
+    def _threshold_factors(self) -> Tuple[float, float]:
+        """Return the (low, high) multipliers equivalent to the percentage thresholds."""
+        # lo <= (back - lay) / lay * 100 <= hi  is  lay * lo_factor <= back <= lay * hi_factor
+        # for lay > 0, so each pair costs two multiplies and no division
+        return 1 + self.min_threshold / 100, 1 + self.max_threshold / 100
+    
+    @staticmethod
+    def _within_threshold(orbit_lay: float, golbet_back: float, lo_factor: float, hi_factor: float) -> bool:
+        """The single threshold rule shared by is_valid_opportunity and valid_indices."""
+        return (orbit_lay > 0 and golbet_back > 0
+                and orbit_lay * lo_factor <= golbet_back <= orbit_lay * hi_factor)
+    
+    def valid_indices(self, orbit_lays: List[float], golbet_backs: List[float]) -> List[int]:
+        """
+        Check a batch of odds pairs against the threshold range in one pass.
+        
+        Args:
+            orbit_lays: LAY odds from Orbit
+            golbet_backs: BACK odds from Golbet, aligned with orbit_lays
+            
+        Returns:
+            Indices of the pairs that are within threshold
+        """
+        lo_factor, hi_factor = self._threshold_factors()
+        within = self._within_threshold
+        return [
+            i for i, (orbit_lay, golbet_back) in enumerate(zip(orbit_lays, golbet_backs))
+            if within(orbit_lay, golbet_back, lo_factor, hi_factor)
+        ]
     
     def format_odds_difference(self, orbit_lay: float, golbet_back: float) -> str:
         """
@@ -264,6 +370,48 @@ class ArbitrageCalculator:
             return f"{numeric_diff:.4f} ({percentage_diff:.2f}%)"
 
 
+def _iter_home_odds(match_rows: List) -> Iterator[Tuple[str, float]]:
+    """
+    Yield (team_name, home_odds) for each scraped match row.
+    
+    Args:
+        match_rows: Scraped rows (format: [{"home": "Team A", "away": "Team B"}, {"label": "1", "odds": 2.0}, ...])
+        
+    Yields:
+        "Home vs Away" and the first parseable home-win ('1') odds of the row
+    """
+    for match_data in match_rows:
+        if not isinstance(match_data, list) or len(match_data) < 4:
+            continue
+        
+        # Extract team names from first item
+        team_info = match_data[0]
+        if not isinstance(team_info, dict) or 'home' not in team_info or 'away' not in team_info:
+            continue
+        # Interned: the same fixture names recur every cycle and key several dicts
+        team_name = sys.intern(f"{team_info['home']} vs {team_info['away']}")
+        
+        for item in match_data[1:]:
+            if isinstance(item, dict) and 'label' in item and 'odds' in item and item['label'] == '1':  # Home win
+                try:
+                    odds = float(item['odds'])
+                except (ValueError, TypeError):
+                    continue
+                yield team_name, odds
+                break
+
+
+# Shared so its normalization cache carries over from one scan to the next
+_team_matcher: Optional[TeamMatcher] = None
+
+def _get_team_matcher() -> TeamMatcher:
+    """Return the TeamMatcher used by find_arbitrage_opportunities, creating it on first use."""
+    global _team_matcher
+    if _team_matcher is None:
+        _team_matcher = TeamMatcher(match_threshold=75)
+    return _team_matcher
+
+
 def find_arbitrage_opportunities(orbit_data: List[Dict], golbet_data: List[Dict]) -> List[Dict]:
     """
     Find arbitrage opportunities between Orbit and Golbet data.
@@ -275,125 +423,93 @@ def find_arbitrage_opportunities(orbit_data: List[Dict], golbet_data: List[Dict]
     Returns:
         List of arbitrage opportunities
     """
+    return find_arbitrage_candidates(orbit_data, golbet_data)[0]
+
+
+def find_arbitrage_candidates(orbit_data: List[Dict], golbet_data: List[Dict]) -> Tuple[List[Dict], Dict[str, float], Dict[str, float]]:
+    """
+    find_arbitrage_opportunities, also returning the teams the matcher could not pair.
+    
+    Args:
+        orbit_data: List of Orbit market snapshots
+        golbet_data: List of Golbet market snapshots
+        
+    Returns:
+        (opportunities, unmatched Orbit home-win odds by team, unmatched Golbet home-win odds by team)
+    """
     try:
         print("[ARBITRAGE] Starting opportunity detection...")
         
         # Initialize components
-        team_matcher = TeamMatcher(match_threshold=75)
+        team_matcher = _get_team_matcher()
         calculator = ArbitrageCalculator(min_threshold=-1.0, max_threshold=30.0)
         
-        # Process Orbit data to extract team names and odds
-        orbit_processed = []
-        for match_data in orbit_data:
-            if isinstance(match_data, list) and len(match_data) >= 4:
-                # Extract team names from first item
-                team_info = match_data[0]
-                if isinstance(team_info, dict) and 'home' in team_info and 'away' in team_info:
-                    home_team = team_info['home']
-                    away_team = team_info['away']
-                    team_name = f"{home_team} vs {away_team}"
-                    
-                    # Extract lay odds (assuming first odds is lay odds)
-                    for item in match_data[1:]:
-                        if isinstance(item, dict) and 'label' in item and 'odds' in item:
-                            if item['label'] == '1':  # Home win
-                                try:
-                                    odds = float(item['odds'])
-                                    orbit_processed.append({
-                                        'team_name': team_name,
-                                        'lay_odds': odds,
-                                        'home_team': home_team,
-                                        'away_team': away_team
-                                    })
-                                    break
-                                except (ValueError, TypeError):
-                                    continue
-        
-        # Process Golbet data to extract team names and odds
-        golbet_processed = []
-        for match_data in golbet_data:
-            if isinstance(match_data, list) and len(match_data) >= 4:
-                # Extract team names from first item
-                team_info = match_data[0]
-                if isinstance(team_info, dict) and 'home' in team_info and 'away' in team_info:
-                    home_team = team_info['home']
-                    away_team = team_info['away']
-                    team_name = f"{home_team} vs {away_team}"
-                    
-                    # Extract back odds (assuming first odds is back odds)
-                    for item in match_data[1:]:
-                        if isinstance(item, dict) and 'label' in item and 'odds' in item:
-                            if item['label'] == '1':  # Home win
-                                try:
-                                    odds = float(item['odds'])
-                                    golbet_processed.append({
-                                        'team_name': team_name,
-                                        'back_odds': odds,
-                                        'home_team': home_team,
-                                        'away_team': away_team
-                                    })
-                                    break
-                                except (ValueError, TypeError):
-                                    continue
-        
-        print(f"[ARBITRAGE] Processed {len(orbit_processed)} Orbit matches and {len(golbet_processed)} Golbet matches")
+        # Index home-win odds by team name straight from the scraped rows
+        # (first occurrence wins), without intermediate per-site lists
+        orbit_by_name: Dict[str, float] = {}
+        for team_name, odds in _iter_home_odds(orbit_data):
+            orbit_by_name.setdefault(team_name, odds)
+        
+        golbet_by_name: Dict[str, float] = {}
+        for team_name, odds in _iter_home_odds(golbet_data):
+            golbet_by_name.setdefault(team_name, odds)
+        
+        print(f"[ARBITRAGE] Processed {len(orbit_by_name)} Orbit matches and {len(golbet_by_name)} Golbet matches")
         
         # Extract team names for matching
-        orbit_teams = [item['team_name'] for item in orbit_processed]
-        golbet_teams = [item['team_name'] for item in golbet_processed]
+        orbit_teams = list(orbit_by_name)
+        golbet_teams = list(golbet_by_name)
         
         print(f"[ARBITRAGE] Found {len(orbit_teams)} Orbit teams and {len(golbet_teams)} Golbet teams")
         
         # Match teams
         team_matches = team_matcher.match_all_teams(orbit_teams, golbet_teams)
         
+        # Teams left unpaired, for callers that try to match them another way
+        matched_golbet = set(team_matches.values())
+        orbit_unmatched = {team: odds for team, odds in orbit_by_name.items() if team not in team_matches}
+        golbet_unmatched = {team: odds for team, odds in golbet_by_name.items() if team not in matched_golbet}
+        
         if not team_matches:
             print("[ARBITRAGE] No team matches found")
-            return []
+            return [], orbit_unmatched, golbet_unmatched
         
         print(f"[ARBITRAGE] Successfully matched {len(team_matches)} teams")
         
+        # Gather matched pairs as parallel columns so the threshold runs as one batch
+        pair_names = list(team_matches)
+        orbit_odds = [orbit_by_name[orbit_team] for orbit_team in pair_names]
+        golbet_odds = [golbet_by_name[golbet_team] for golbet_team in team_matches.values()]
+        
         # Find opportunities
         opportunities = []
-        now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        now_str = ts()
         
-        for orbit_team, golbet_team in team_matches.items():
-            # Find corresponding data
-            orbit_item = next((item for item in orbit_processed if item['team_name'] == orbit_team), None)
-            golbet_item = next((item for item in golbet_processed if item['team_name'] == orbit_team), None)
+        for i in calculator.valid_indices(orbit_odds, golbet_odds):
+            orbit_lay = orbit_odds[i]
+            golbet_back = golbet_odds[i]
             
-            if not orbit_item or not golbet_item:
-                continue
-            
-            # Extract odds
-            orbit_lay = orbit_item.get('lay_odds', 0)
-            golbet_back = golbet_item.get('back_odds', 0)
+            # Format odds difference
+            odds_diff_str = calculator.format_odds_difference(orbit_lay, golbet_back)
             
-            if orbit_lay <= 0 or golbet_back <= 0:
-                continue
+            opportunity = {
+                # Escaped once here; notify templates substitute it verbatim into HTML
+                "match_name": html.escape(pair_names[i], quote=False),
+                "orbit_lay_odds": orbit_lay,
+                "comparison_odds": golbet_back,
+                "odds_difference": odds_diff_str,
+                "market_type": "1X2",
+                "detection_time": now_str
+            }
             
-            # Check if valid opportunity
-            if calculator.is_valid_opportunity(orbit_lay, golbet_back):
-                # Format odds difference
-                odds_diff_str = calculator.format_odds_difference(orbit_lay, golbet_back)
-                
-                opportunity = {
-                    "match_name": orbit_team,
-                    "orbit_lay_odds": orbit_lay,
-                    "comparison_odds": golbet_back,
-                    "odds_difference": odds_diff_str,
-                    "market_type": "1X2",
-                    "detection_time": now_str
-                }
-                
-                opportunities.append(opportunity)
-                print(f"[ARBITRAGE] ✅ Opportunity found: {opportunity['match_name']} - {odds_diff_str}")
+            opportunities.append(opportunity)
+            print(f"[ARBITRAGE] ✅ Opportunity found: {opportunity['match_name']} - {odds_diff_str}")
         
         print(f"[ARBITRAGE] Found {len(opportunities)} valid opportunities")
-        return opportunities
+        return opportunities, orbit_unmatched, golbet_unmatched
         
     except Exception as e:
         print(f"[ARBITRAGE] Error finding opportunities: {e}")
         import traceback
         traceback.print_exc()
-        return []
+        return [], {}, {}
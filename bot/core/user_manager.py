@@ -1,7 +1,7 @@
 from __future__ import annotations
 import json
 import os
-from typing import Set, Dict, Any
+from typing import Set, Dict, Any, Iterable
 from datetime import datetime
 from pathlib import Path
 
@@ -127,6 +127,15 @@ class UserManager:
             self.user_data[user_id]['last_notification'] = datetime.now().isoformat()
             self.user_data[user_id]['total_notifications'] += 1
     
+    def update_users_activity(self, user_ids: Iterable[int]) -> None:
+        """Update activity for several users at once, with one shared timestamp."""
+        now = datetime.now().isoformat()
+        for user_id in user_ids:
+            data = self.user_data.get(user_id)
+            if data is not None:
+                data['last_notification'] = now
+                data['total_notifications'] += 1
+    
     def get_user_info(self, user_id: int) -> Dict[str, Any]:
         """Get information about a specific user."""
         return self.user_data.get(user_id, {})
@@ -2,6 +2,7 @@
 from __future__ import annotations
 import asyncio, os, sys
 from dotenv import load_dotenv
+from .core.logger import setup_logging, shutdown_logging
 
 def print_banner():
     """Print a beautiful banner for the application."""
@@ -154,6 +155,9 @@ def main():
         print("   See README.md for setup instructions.")
         sys.exit(1)
     
+    # Queue-backed logging so log I/O stays off the event loop
+    setup_logging()
+    
     # Print banner
     print_banner()
     
@@ -192,6 +196,8 @@ def main():
             print(f"❌ Error: {e}")
             print("🔄 Restarting main menu...")
             continue
+    
+    shutdown_logging()
 
 if __name__ == "__main__" or __name__ == "bot.main":
     main()
@@ -7,14 +7,15 @@ from ..core.models import MarketSnapshot
 from ..core.persistent_browser import PersistentBrowser
 
 
-async def _scrape_golbet724_page_persistent(page: Page) -> Dict[str, Any] | None:
+async def _scrape_golbet724_page_persistent(browser: PersistentBrowser) -> Dict[str, Any] | None:
     """Scrape the Golbet724 page using an existing persistent page."""
+    page = browser.page
     try:
         print("[GOLBET] Using persistent browser page")
         
         # Navigate to the actual page
         print("[GOLBET] Navigating to https://www.golbet724.com/maclar")
-        await page.goto("https://www.golbet724.com/maclar", wait_until="domcontentloaded")
+        await browser.goto("https://www.golbet724.com/maclar")
         
         # Check if we're on a redirect page
         redirect_text = await page.evaluate("() => document.body.innerText")
@@ -223,7 +224,7 @@ async def fetch_golbet724_snapshots(browser_manager=None) -> List[MarketSnapshot
             
             if page:
                 print("[GOLBET] ✅ Persistent page ready, scraping data...")
-                result = await _scrape_golbet724_page_persistent(page)
+                result = await _scrape_golbet724_page_persistent(browser)
                 if result:
                     print(f"[GOLBET] ✅ Scraped {len(result)} matches using persistent browser")
                     return result
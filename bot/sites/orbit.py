@@ -1,22 +1,69 @@
 from __future__ import annotations
 from typing import List, Dict, Any, Optional
 
+from bs4 import BeautifulSoup
 from playwright.async_api import async_playwright, Page
 from ..core.models import MarketSnapshot
 from ..core.persistent_browser import PersistentBrowser
 
 
-async def _scrape_orbit_page_persistent(page: Page) -> Dict[str, Any] | None:
+_ODDS_LABELS = ("1", "X", "2")
+
+
+def _parse_rows(rows_html_list: List[str]) -> list:
+    """Parse captured .rowsContainer HTML into per-match odds lists.
+
+    All containers are joined and parsed as one document, so the parser
+    is set up once per scrape rather than once per container.
+    """
+    nums: list = []
+    soup = BeautifulSoup("".join(rows_html_list), "html.parser")
+    for row in soup.select(
+        'div.biab_group-markets-table-row[data-market-prices="true"]'
+    ):
+
+        teams = row.select(".biab_market-title-team-names p[title]")
+        if len(teams) < 2:
+            continue
+        home = teams[0].get("title") or teams[0].text.strip()
+        away = teams[1].get("title") or teams[1].text.strip()
+        cnt: int = 0
+        odds_data = []
+        for wrapper in row.select(".styles_betContent__wrapper__25jEo"):
+            odds_data.append({"home": home, "away": away})
+            for odds_el in wrapper.select(".betContentCellMarket"):
+                if cnt % 2 != 0:
+                    txt = (odds_el.get_text(strip=True) or "").replace(",", "")
+                    label = (
+                        _ODDS_LABELS[cnt // 2]
+                        if (cnt // 2) < len(_ODDS_LABELS)
+                        else f"label_{cnt//2}"
+                    )
+                    if txt == "":
+                        odds_data.append({"label": label, "odds": 0.0})
+                    else:
+                        try:
+                            odds_data.append({"label": label, "odds": float(txt)})
+                        except Exception:
+                            pass
+                cnt += 1
+                if len(odds_data) >= 6:
+                    break
+            if len(odds_data) >= 6:
+                break
+        nums.append(odds_data)
+    return nums
+
+
+async def _scrape_orbit_page_persistent(browser: PersistentBrowser) -> Dict[str, Any] | None:
     """Scrape the Orbit page using an existing persistent page."""
+    page = browser.page
     try:
         print("[ORBIT] Using persistent browser page")
         
         # Navigate to the Orbit page with better loading strategy
         print("[ORBIT] Navigating to https://orbitxch.com/customer/sport/1")
-        await page.goto(
-            "https://orbitxch.com/customer/sport/1", 
-            wait_until="domcontentloaded"  # Changed from networkidle for faster loading
-        )
+        await browser.goto("https://orbitxch.com/customer/sport/1")
         
         # Wait for page to be ready with faster loading strategy
         print("[ORBIT] Waiting for page content to load...")
@@ -195,8 +242,6 @@ async def _scrape_orbit_page_persistent(page: Page) -> Dict[str, Any] | None:
                     except:
                         pass
 
-            from bs4 import BeautifulSoup
-
             # Selection IDs (1, X, 2) if you want them
             nums: list[float] = []
             
@@ -232,47 +277,7 @@ async def _scrape_orbit_page_persistent(page: Page) -> Dict[str, Any] | None:
                     print(f"[ORBIT] Direct data extraction failed: {e}")
                     return None
             
-            for container_html in rows_html_list:
-                soup = BeautifulSoup(container_html, "html.parser")
-                for row in soup.select(
-                    'div.biab_group-markets-table-row[data-market-prices="true"]'
-                ):
-
-                    teams = row.select(".biab_market-title-team-names p[title]")
-                    if len(teams) < 2:
-                        continue
-                    home = teams[0].get("title") or teams[0].text.strip()
-                    away = teams[1].get("title") or teams[1].text.strip()
-                    cnt: int = 0
-                    labels = ["1", "X", "2"]
-                    odds_data = []
-                    for wrapper in row.select(".styles_betContent__wrapper__25jEo"):
-                        odds_data.append({"home": home, "away": away})
-                        for odds_el in wrapper.select(".betContentCellMarket"):
-                            if cnt % 2 != 0:
-                                txt = (odds_el.get_text(strip=True) or "").replace(
-                                    ",", ""
-                                )
-                                label = (
-                                    labels[cnt // 2]
-                                    if (cnt // 2) < len(labels)
-                                    else f"label_{cnt//2}"
-                                )
-                                if txt == "":
-                                    odds_data.append({"label": label, "odds": 0.0})
-                                else:
-                                    try:
-                                        odds_data.append(
-                                            {"label": label, "odds": float(txt)}
-                                        )
-                                    except Exception:
-                                        pass
-                            cnt += 1
-                            if len(odds_data) >= 6:
-                                break
-                        if len(odds_data) >= 6:
-                            break
-                    nums.append(odds_data)
+            nums.extend(_parse_rows(rows_html_list))
             return nums
         except Exception as e:
             print("[ORBIT] Error capturing .rowsContainer:", e)
@@ -507,52 +512,7 @@ async def _scrape_orbit_page() -> Dict[str, Any] | None:
                     ".rowsContainer", "els => els.map(el => el.outerHTML)"
                 )
 
-                from bs4 import BeautifulSoup
-
-                # Selection IDs (1, X, 2) if you want them
-                nums: list[float] = []
-                for container_html in rows_html_list or []:
-                    soup = BeautifulSoup(container_html, "html.parser")
-                    for row in soup.select(
-                        'div.biab_group-markets-table-row[data-market-prices="true"]'
-                    ):
-
-                        teams = row.select(".biab_market-title-team-names p[title]")
-                        if len(teams) < 2:
-                            continue
-                        home = teams[0].get("title") or teams[0].text.strip()
-                        away = teams[1].get("title") or teams[1].text.strip()
-                        cnt: int = 0
-                        labels = ["1", "X", "2"]
-                        odds_data = []
-                        for wrapper in row.select(".styles_betContent__wrapper__25jEo"):
-                            odds_data.append({"home": home, "away": away})
-                            for odds_el in wrapper.select(".betContentCellMarket"):
-                                if cnt % 2 != 0:
-                                    txt = (odds_el.get_text(strip=True) or "").replace(
-                                        ",", ""
-                                    )
-                                    label = (
-                                        labels[cnt // 2]
-                                        if (cnt // 2) < len(labels)
-                                        else f"label_{cnt//2}"
-                                    )
-                                    if txt == "":
-                                        odds_data.append({"label": label, "odds": 0.0})
-                                    else:
-                                        try:
-                                            odds_data.append(
-                                                {"label": label, "odds": float(txt)}
-                                            )
-                                        except Exception:
-                                            pass
-                                cnt += 1
-                                if len(odds_data) >= 6:
-                                    break
-                            if len(odds_data) >= 6:
-                                break
-                        nums.append(odds_data)
-                return nums
+                return _parse_rows(rows_html_list or [])
             except Exception as e:
                 print("[ORBIT] Error capturing .rowsContainer:", e)
 
@@ -585,7 +545,7 @@ async def fetch_orbit_snapshots(browser_manager=None) -> List[MarketSnapshot]:
             
             if page:
                 print("[ORBIT] ✅ Persistent page ready, scraping data...")
-                result = await _scrape_orbit_page_persistent(page)
+                result = await _scrape_orbit_page_persistent(browser)
                 if result:
                     print(f"[ORBIT] ✅ Scraped {len(result)} matches using persistent browser")
                     return result
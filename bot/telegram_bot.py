@@ -2,12 +2,16 @@ from __future__ import annotations
 import asyncio
 import os
 import httpx
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 from .core.user_manager import UserManager
 from .core.command_handler import CommandHandler
+from .core.notify import ts
 from datetime import datetime
 
+# Most personalized sends one broadcast keeps in flight at once
+BROADCAST_CONCURRENCY = 20
+
 # Load environment variables
 load_dotenv()
 
@@ -29,21 +33,37 @@ class TelegramBot:
         self.bot_info = None
         self.last_update_id = 0
         
+        # Shared HTTP client (created on first use) so polls and sends reuse connections
+        self._api = f"/bot{self.bot_token}"
+        self._client: Optional[httpx.AsyncClient] = None
+        
         print(f"[TELEGRAM BOT] Initialized with token: {self.bot_token[:10]}...")
         print(f"[TELEGRAM BOT] {self.user_manager.get_user_count()} registered users loaded")
     
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the bot's Telegram HTTP client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(base_url="https://api.telegram.org", timeout=10)
+        return self._client
+    
+    async def close(self) -> None:
+        """Close the bot's HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
     async def get_bot_info(self) -> Dict[str, Any]:
         """Get bot information from Telegram."""
         try:
-            url = f"https://api.telegram.org/bot{self.bot_token}/getMe"
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(url)
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('ok'):
-                        self.bot_info = data['result']
-                        print(f"[TELEGRAM BOT] Bot info: @{self.bot_info['username']} ({self.bot_info['first_name']})")
-                        return self.bot_info
+            url = f"{self._api}/getMe"
+            client = self._get_client()
+            response = await client.get(url)
+            if response.status_code == 200:
+                data = response.json()
+                if data.get('ok'):
+                    self.bot_info = data['result']
+                    print(f"[TELEGRAM BOT] Bot info: @{self.bot_info['username']} ({self.bot_info['first_name']})")
+                    return self.bot_info
         except Exception as e:
             print(f"[TELEGRAM BOT] Error getting bot info: {e}")
         return None
@@ -51,7 +71,7 @@ class TelegramBot:
     async def get_updates(self) -> list:
         """Get updates from Telegram."""
         try:
-            url = f"https://api.telegram.org/bot{self.bot_token}/getUpdates"
+            url = f"{self._api}/getUpdates"
             params = {
                 'offset': self.last_update_id + 1,
                 'timeout': 5,  # Very short timeout for immediate response
@@ -60,20 +80,20 @@ class TelegramBot:
             
             print(f"[TELEGRAM BOT] Polling for updates with offset {self.last_update_id + 1}")
             
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(url, params=params)
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('ok'):
-                        updates = data['result']
-                        if updates:
-                            self.last_update_id = updates[-1]['update_id']
-                            print(f"[TELEGRAM BOT] Received {len(updates)} updates, new offset: {self.last_update_id}")
-                        return updates
-                    else:
-                        print(f"[TELEGRAM BOT] Telegram API error: {data}")
+            client = self._get_client()
+            response = await client.get(url, params=params)
+            if response.status_code == 200:
+                data = response.json()
+                if data.get('ok'):
+                    updates = data['result']
+                    if updates:
+                        self.last_update_id = updates[-1]['update_id']
+                        print(f"[TELEGRAM BOT] Received {len(updates)} updates, new offset: {self.last_update_id}")
+                    return updates
                 else:
-                    print(f"[TELEGRAM BOT] HTTP error: {response.status_code} - {response.text}")
+                    print(f"[TELEGRAM BOT] Telegram API error: {data}")
+            else:
+                print(f"[TELEGRAM BOT] HTTP error: {response.status_code} - {response.text}")
         except Exception as e:
             print(f"[TELEGRAM BOT] Error getting updates: {e}")
         return []
@@ -81,7 +101,7 @@ class TelegramBot:
     async def get_current_updates(self) -> list:
         """Get all current updates without offset to process pending messages."""
         try:
-            url = f"https://api.telegram.org/bot{self.bot_token}/getUpdates"
+            url = f"{self._api}/getUpdates"
             params = {
                 'timeout': 1,
                 'allowed_updates': ['message']
@@ -89,18 +109,18 @@ class TelegramBot:
             
             print("[TELEGRAM BOT] Getting current updates to process pending messages...")
             
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(url, params=params)
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('ok'):
-                        updates = data['result']
-                        if updates:
-                            self.last_update_id = updates[-1]['update_id']
-                            print(f"[TELEGRAM BOT] Found {len(updates)} pending updates, new offset: {self.last_update_id}")
-                        return updates
-                else:
-                    print(f"[TELEGRAM BOT] HTTP error getting current updates: {response.status_code}")
+            client = self._get_client()
+            response = await client.get(url, params=params)
+            if response.status_code == 200:
+                data = response.json()
+                if data.get('ok'):
+                    updates = data['result']
+                    if updates:
+                        self.last_update_id = updates[-1]['update_id']
+                        print(f"[TELEGRAM BOT] Found {len(updates)} pending updates, new offset: {self.last_update_id}")
+                    return updates
+            else:
+                print(f"[TELEGRAM BOT] HTTP error getting current updates: {response.status_code}")
         except Exception as e:
             print(f"[TELEGRAM BOT] Error getting current updates: {e}")
         return []
@@ -125,7 +145,7 @@ class TelegramBot:
                 return
             
             # Check if this is a start command before processing
-            is_start_command = text.strip().lower() in ['start', '/start']
+            is_start_command = self.command_handler.parse_command(text) == 'start'
             was_registered_before = self.user_manager.is_registered(user_id)
             
             print(f"[TELEGRAM BOT] Is start command: {is_start_command}")
@@ -191,21 +211,21 @@ Happy trading! 🎯💰"""
     async def send_message(self, chat_id: int, text: str) -> bool:
         """Send a message to a specific chat."""
         try:
-            url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
+            url = f"{self._api}/sendMessage"
             data = {
                 'chat_id': chat_id,
                 'text': text,
                 'parse_mode': 'HTML'
             }
             
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.post(url, json=data)
-                if response.status_code == 200:
-                    print(f"[TELEGRAM BOT] Message sent to {chat_id}")
-                    return True
-                else:
-                    print(f"[TELEGRAM BOT] Failed to send message. Status: {response.status_code}")
-                    return False
+            client = self._get_client()
+            response = await client.post(url, json=data)
+            if response.status_code == 200:
+                print(f"[TELEGRAM BOT] Message sent to {chat_id}")
+                return True
+            else:
+                print(f"[TELEGRAM BOT] Failed to send message. Status: {response.status_code}")
+                return False
                     
         except Exception as e:
             print(f"[TELEGRAM BOT] Error sending message: {e}")
@@ -217,23 +237,23 @@ Happy trading! 🎯💰"""
             print("[TELEGRAM BOT] Testing connection to Telegram...")
             
             # Test getMe endpoint
-            url = f"https://api.telegram.org/bot{self.bot_token}/getMe"
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(url)
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('ok'):
-                        bot_info = data['result']
-                        print(f"[TELEGRAM BOT] ✅ Connection successful!")
-                        print(f"[TELEGRAM BOT] Bot: @{bot_info['username']} ({bot_info['first_name']})")
-                        print(f"[TELEGRAM BOT] Bot ID: {bot_info['id']}")
-                        return True
-                    else:
-                        print(f"[TELEGRAM BOT] ❌ Telegram API error: {data}")
-                        return False
+            url = f"{self._api}/getMe"
+            client = self._get_client()
+            response = await client.get(url)
+            if response.status_code == 200:
+                data = response.json()
+                if data.get('ok'):
+                    bot_info = data['result']
+                    print(f"[TELEGRAM BOT] ✅ Connection successful!")
+                    print(f"[TELEGRAM BOT] Bot: @{bot_info['username']} ({bot_info['first_name']})")
+                    print(f"[TELEGRAM BOT] Bot ID: {bot_info['id']}")
+                    return True
                 else:
-                    print(f"[TELEGRAM BOT] ❌ HTTP error: {response.status_code}")
+                    print(f"[TELEGRAM BOT] ❌ Telegram API error: {data}")
                     return False
+            else:
+                print(f"[TELEGRAM BOT] ❌ HTTP error: {response.status_code}")
+                return False
                     
         except Exception as e:
             print(f"[TELEGRAM BOT] ❌ Connection test failed: {e}")
@@ -243,22 +263,22 @@ Happy trading! 🎯💰"""
         """Clear any existing webhook to ensure polling works correctly."""
         try:
             print("[TELEGRAM BOT] Clearing any existing webhook...")
-            url = f"https://api.telegram.org/bot{self.bot_token}/deleteWebhook"
+            url = f"{self._api}/deleteWebhook"
             params = {'drop_pending_updates': 'true'}
             
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(url, params=params)
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('ok'):
-                        print("[TELEGRAM BOT] ✅ Webhook cleared successfully")
-                        return True
-                    else:
-                        print(f"[TELEGRAM BOT] ❌ Failed to clear webhook: {data}")
-                        return False
+            client = self._get_client()
+            response = await client.get(url, params=params)
+            if response.status_code == 200:
+                data = response.json()
+                if data.get('ok'):
+                    print("[TELEGRAM BOT] ✅ Webhook cleared successfully")
+                    return True
                 else:
-                    print(f"[TELEGRAM BOT] ❌ HTTP error clearing webhook: {response.status_code}")
+                    print(f"[TELEGRAM BOT] ❌ Failed to clear webhook: {data}")
                     return False
+            else:
+                print(f"[TELEGRAM BOT] ❌ HTTP error clearing webhook: {response.status_code}")
+                return False
                     
         except Exception as e:
             print(f"[TELEGRAM BOT] ❌ Error clearing webhook: {e}")
@@ -345,45 +365,58 @@ Happy trading! 🎯💰"""
         except Exception as e:
             print(f"[TELEGRAM BOT] ❌ Unexpected error: {e}")
         finally:
+            await self.close()
             print("[TELEGRAM BOT] 🔄 Bot shutdown complete")
 
-    async def broadcast_to_users(self, message: str) -> None:
-        """Broadcast a message to all registered users."""
+    async def broadcast_to_users(self, message: str) -> int:
+        """Broadcast a message to all registered users; returns how many received it."""
+        delivered = 0
         try:
             registered_users = self.user_manager.get_registered_users()
             if not registered_users:
                 print("[TELEGRAM BOT] No registered users to broadcast to")
-                return
+                return 0
             
             print(f"[TELEGRAM BOT] Broadcasting message to {len(registered_users)} users...")
             
+            # Personalize every copy up front, then send them concurrently, BROADCAST_CONCURRENCY at a time
+            slots = asyncio.Semaphore(BROADCAST_CONCURRENCY)
+            
+            async def send_one(user_id, text: str) -> bool:
+                async with slots:
+                    return await self.send_message(user_id, text)
+            
+            names = {}
+            sends = []
             for user_id in registered_users:
-                try:
-                    # Get user info for personalization
-                    user_info = self.user_manager.get_user_info(user_id)
-                    username = user_info.get('username', 'User')
-                    first_name = user_info.get('first_name', 'User')
-                    
-                    # Personalize message
-                    personalized_message = message.replace("{username}", username).replace("{first_name}", first_name)
-                    
-                    # Send message to user
-                    success = await self.send_message(user_id, personalized_message)
-                    if success:
-                        print(f"[TELEGRAM BOT] ✅ Message sent to user {user_id} ({username or first_name})")
-                        # Update user activity
-                        self.user_manager.update_user_activity(user_id)
-                    else:
-                        print(f"[TELEGRAM BOT] ❌ Failed to send message to user {user_id}")
-                        
-                except Exception as e:
-                    print(f"[TELEGRAM BOT] ❌ Error sending message to user {user_id}: {e}")
-                    continue
+                # Get user info for personalization
+                user_info = self.user_manager.get_user_info(user_id)
+                username = user_info.get('username') or 'User'
+                first_name = user_info.get('first_name') or 'User'
+                names[user_id] = username
+                
+                # Personalize message
+                personalized_message = message.replace("{username}", username).replace("{first_name}", first_name)
+                sends.append(send_one(user_id, personalized_message))
+            
+            results = await asyncio.gather(*sends, return_exceptions=True)
+            
+            for user_id, result in zip(registered_users, results):
+                if isinstance(result, Exception):
+                    print(f"[TELEGRAM BOT] ❌ Error sending message to user {user_id}: {result}")
+                elif result:
+                    delivered += 1
+                    print(f"[TELEGRAM BOT] ✅ Message sent to user {user_id} ({names[user_id]})")
+                    # Update user activity
+                    self.user_manager.update_user_activity(user_id)
+                else:
+                    print(f"[TELEGRAM BOT] ❌ Failed to send message to user {user_id}")
             
             print(f"[TELEGRAM BOT] ✅ Broadcasting completed to {len(registered_users)} users")
             
         except Exception as e:
             print(f"[TELEGRAM BOT] ❌ Error in broadcasting: {e}")
+        return delivered
     
     async def schedule_broadcast(self, message: str, delay_seconds: int = 60) -> None:
         """Schedule a broadcast message after a delay."""
@@ -403,7 +436,7 @@ Happy trading! 🎯💰"""
                 # Send test broadcast immediately
                 test_message = f"""🧪 <b>ADMIN BROADCAST TEST</b> 🧪
 
-⏰ <b>Time:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+⏰ <b>Time:</b> {ts()}
 👤 <b>Admin:</b> {user_id}
 📢 <b>Type:</b> Manual broadcast test
 
@@ -437,31 +470,33 @@ Happy trading! 🎯💰"""
             print(f"[TELEGRAM BOT] ❌ Error in admin command: {e}")
             await self.send_message(chat_id, "❌ Error processing admin command")
 
-    async def send_arbitrage_results(self, arbitrage_data: str) -> None:
-        """Send arbitrage results to all registered users."""
+    async def send_arbitrage_results(self, arbitrage_data: str) -> int:
+        """Send arbitrage results to all registered users; returns how many received them."""
         try:
             registered_users = self.user_manager.get_registered_users()
             if not registered_users:
                 print("[TELEGRAM BOT] No registered users to send arbitrage results to")
-                return
+                return 0
             
             print(f"[TELEGRAM BOT] Sending arbitrage results to {len(registered_users)} users...")
             
             # Format the arbitrage message
             arbitrage_message = f"""🎯 <b>ARBITRAGE OPPORTUNITIES DETECTED!</b> 🎯
 
-⏰ <b>Time:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+⏰ <b>Time:</b> {ts()}
 👥 <b>Recipients:</b> {len(registered_users)} registered users
 
 {arbitrage_data}
 
 🚀 <b>Happy arbitrage hunting!</b> 💰"""
             
-            await self.broadcast_to_users(arbitrage_message)
-            print(f"[TELEGRAM BOT] ✅ Arbitrage results sent to {len(registered_users)} users")
+            delivered = await self.broadcast_to_users(arbitrage_message)
+            print(f"[TELEGRAM BOT] ✅ Arbitrage results sent to {delivered}/{len(registered_users)} users")
+            return delivered
             
         except Exception as e:
             print(f"[TELEGRAM BOT] ❌ Error sending arbitrage results: {e}")
+            return 0
     
     async def send_no_opportunities_message(self) -> None:
         """Send message when no arbitrage opportunities are found."""
@@ -472,7 +507,7 @@ Happy trading! 🎯💰"""
             
             no_opportunities_message = f"""🔍 <b>ARBITRAGE SCAN COMPLETED</b> 🔍
 
-⏰ <b>Scan Time:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+⏰ <b>Scan Time:</b> {ts()}
 👥 <b>Recipients:</b> {len(registered_users)} registered users
 
 📊 <b>Scan Results:</b>
@@ -518,4 +553,6 @@ async def main():
         print(f"[MAIN] Error starting bot: {e}")
 
 if __name__ == "__main__":
+    from .core.logger import setup_logging
+    setup_logging()
     asyncio.run(main())
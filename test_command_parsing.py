@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test script for Telegram command parsing.
+Checks which messages resolve to bot commands and which are left as chat.
+"""
+
+from bot.core.command_handler import CommandHandler
+
+class FakeUserManager:
+    """parse_command never touches user storage."""
+
+def _handler() -> CommandHandler:
+    return CommandHandler(FakeUserManager())
+
+def test_bare_and_slash_commands():
+    """Exact 'stop' and '/stop' are commands."""
+    handler = _handler()
+    assert handler.parse_command("stop") == "stop"
+    assert handler.parse_command("/stop") == "stop"
+    assert handler.parse_command("  START ") == "start"
+
+def test_slash_command_variants():
+    """'/stop@Bot now' and '/help status' resolve by their first token."""
+    handler = _handler()
+    assert handler.parse_command("/stop@Bot now") == "stop"
+    assert handler.parse_command("/start@mybot") == "start"
+    assert handler.parse_command("/help status") == "help"
+
+def test_plain_chat_is_not_a_command():
+    """Chat like 'stop now' or 'help me' is not a command."""
+    handler = _handler()
+    for text in ("stop now", "help me", "info about X", "start@bot", "", "/", "/unknown"):
+        assert handler.parse_command(text) is None, text
+
+def main() -> bool:
+    """Run every check and print a summary."""
+    print("🧪 Testing Command Parsing")
+    print("=" * 60)
+
+    checks = [
+        test_bare_and_slash_commands,
+        test_slash_command_variants,
+        test_plain_chat_is_not_a_command,
+    ]
+    passed = 0
+    for check in checks:
+        try:
+            check()
+            passed += 1
+            print(f"   • {check.__doc__} ✅ PASSED")
+        except AssertionError:
+            print(f"   • {check.__doc__} ❌ FAILED")
+
+    print(f"\n📊 {passed}/{len(checks)} checks passed")
+    return passed == len(checks)
+
+if __name__ == "__main__":
+    success = main()
+    print("\n🎉 All tests PASSED!" if success else "\n❌ Some tests FAILED!")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test script for alert deduplication in the scheduler.
+Checks that opportunities are only marked as alerted once the alert is delivered.
+"""
+
+import asyncio
+import os
+import tempfile
+
+from bot.core import scheduler
+from bot.core.dedupe import DedupeCache
+
+OPPORTUNITY = {
+    "match_name": "Real Madrid vs Barcelona",
+    "orbit_lay_odds": 2.0,
+    "comparison_odds": 2.1,
+    "odds_difference": "+0.1000 (+5.00%)",
+    "market_type": "1X2",
+    "detection_time": "2024-01-01 00:00:00",
+}
+KEY = scheduler._dedupe_key(OPPORTUNITY)
+
+class FakeUserManager:
+    """One registered user, no storage."""
+
+    def get_registered_users(self):
+        return ["1"]
+
+    def update_users_activity(self, user_ids):
+        pass
+
+class FakeTelegramBot:
+    """Records alerts and reports a fixed delivery count, or raises."""
+
+    def __init__(self, delivered: int = 1, fail: bool = False):
+        self.delivered = delivered
+        self.fail = fail
+        self.alerts = []
+
+    async def send_arbitrage_results(self, message: str) -> int:
+        self.alerts.append(message)
+        if self.fail:
+            raise RuntimeError("send failed")
+        return self.delivered
+
+    async def broadcast_to_users(self, message: str) -> int:
+        return 1
+
+async def _fetch(browser_manager):
+    # Any non-empty data; matching is replaced below
+    return [[{"home": "Real Madrid", "away": "Barcelona"}]]
+
+async def _match(orbit_data, golbet_data):
+    return [dict(OPPORTUNITY)]
+
+def _run_cycle(dedupe: DedupeCache, bot: FakeTelegramBot) -> str:
+    """Run one scheduler cycle against fake sites, matcher and bot."""
+    saved = (scheduler.fetch_orbit_snapshots, scheduler.fetch_golbet724_snapshots, scheduler._match_opportunities)
+    scheduler.fetch_orbit_snapshots = scheduler.fetch_golbet724_snapshots = _fetch
+    scheduler._match_opportunities = _match
+    try:
+        return asyncio.run(scheduler.run_cycle(dedupe, FakeUserManager(), bot))
+    finally:
+        scheduler.fetch_orbit_snapshots, scheduler.fetch_golbet724_snapshots, scheduler._match_opportunities = saved
+
+def test_delivered_alert_is_marked():
+    """A delivered alert is marked and saved, and not sent again within the window."""
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = os.path.join(tmp, "dedupe.json")
+        dedupe = DedupeCache(window_seconds=600, storage_file=storage)
+        bot = FakeTelegramBot(delivered=1)
+
+        assert _run_cycle(dedupe, bot) == "ok"
+        assert dedupe.seen_recently(KEY)
+        assert DedupeCache(window_seconds=600, storage_file=storage).seen_recently(KEY)
+
+        assert _run_cycle(dedupe, bot) == "ok"
+        assert len(bot.alerts) == 1
+
+def test_undelivered_alert_is_rolled_back():
+    """An alert nobody received releases its key, so the next cycle retries it."""
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = os.path.join(tmp, "dedupe.json")
+        dedupe = DedupeCache(window_seconds=600, storage_file=storage)
+        bot = FakeTelegramBot(delivered=0)
+
+        assert _run_cycle(dedupe, bot) == "ok"
+        assert not dedupe.seen_recently(KEY)
+        assert not os.path.exists(storage)
+
+        bot.delivered = 1
+        assert _run_cycle(dedupe, bot) == "ok"
+        assert len(bot.alerts) == 2
+        assert dedupe.seen_recently(KEY)
+
+def test_failed_send_is_rolled_back():
+    """A send that raises (and whose fallback raises too) leaves the key unmarked."""
+    dedupe = DedupeCache(window_seconds=600)
+    bot = FakeTelegramBot(fail=True)
+
+    assert _run_cycle(dedupe, bot) == "error"
+    assert not dedupe.seen_recently(KEY)
+
+def test_check_and_mark_unmark():
+    """check_and_mark claims a key once; unmark releases it."""
+    dedupe = DedupeCache(window_seconds=600)
+
+    assert dedupe.check_and_mark(KEY)
+    assert not dedupe.check_and_mark(KEY)
+    dedupe.unmark(KEY)
+    assert dedupe.check_and_mark(KEY)
+
+def main() -> bool:
+    """Run every check and print a summary."""
+    print("🧪 Testing Alert Deduplication")
+    print("=" * 60)
+
+    checks = [
+        test_delivered_alert_is_marked,
+        test_undelivered_alert_is_rolled_back,
+        test_failed_send_is_rolled_back,
+        test_check_and_mark_unmark,
+    ]
+    passed = 0
+    for check in checks:
+        try:
+            check()
+            passed += 1
+            print(f"   • {check.__doc__} ✅ PASSED")
+        except AssertionError:
+            print(f"   • {check.__doc__} ❌ FAILED")
+
+    print(f"\n📊 {passed}/{len(checks)} checks passed")
+    return passed == len(checks)
+
+if __name__ == "__main__":
+    success = main()
+    print("\n🎉 All tests PASSED!" if success else "\n❌ Some tests FAILED!")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test script for the arbitrage threshold rule.
+Checks that single-pair and batch checks agree, including at the -1%/+30% edges.
+"""
+
+from bot.core.team_matcher import ArbitrageCalculator
+
+# (orbit_lay, golbet_back, expected)
+CASES = [
+    (2.00, 2.20, True),    # +10%
+    (2.00, 1.99, True),    # -0.5%
+    (2.00, 2.60, True),    # +30%, exactly on the edge
+    (2.00, 1.98, True),    # -1%, exactly on the edge
+    (2.00, 1.95, False),   # -2.5%
+    (2.00, 2.80, False),   # +40%
+    (2.00, 2.61, False),   # just over +30%
+    (2.00, 1.979, False),  # just under -1%
+    (0.0, 1.50, False),    # no Orbit odds
+    (1.50, 0.0, False),    # no Golbet odds
+    (-2.0, -2.0, False),   # negative odds
+]
+
+def test_is_valid_opportunity():
+    """is_valid_opportunity matches the expected result for every case."""
+    calculator = ArbitrageCalculator(min_threshold=-1.0, max_threshold=30.0)
+    for orbit_lay, golbet_back, expected in CASES:
+        assert calculator.is_valid_opportunity(orbit_lay, golbet_back) is expected, (orbit_lay, golbet_back)
+
+def test_valid_indices_agrees():
+    """valid_indices selects exactly the pairs is_valid_opportunity accepts."""
+    calculator = ArbitrageCalculator(min_threshold=-1.0, max_threshold=30.0)
+    indices = calculator.valid_indices([c[0] for c in CASES], [c[1] for c in CASES])
+    assert indices == [i for i, case in enumerate(CASES) if case[2]]
+
+def test_within_threshold_edges():
+    """_within_threshold accepts both edges and rejects non-positive odds."""
+    calculator = ArbitrageCalculator(min_threshold=-1.0, max_threshold=30.0)
+    lo_factor, hi_factor = calculator._threshold_factors()
+    assert calculator._within_threshold(2.0, 1.98, lo_factor, hi_factor)
+    assert calculator._within_threshold(2.0, 2.6, lo_factor, hi_factor)
+    assert not calculator._within_threshold(0.0, 0.0, lo_factor, hi_factor)
+    assert not calculator._within_threshold(2.0, -1.0, lo_factor, hi_factor)
+
+def main() -> bool:
+    """Run every check and print a summary."""
+    print("🧪 Testing Arbitrage Threshold")
+    print("=" * 60)
+
+    checks = [
+        test_is_valid_opportunity,
+        test_valid_indices_agrees,
+        test_within_threshold_edges,
+    ]
+    passed = 0
+    for check in checks:
+        try:
+            check()
+            passed += 1
+            print(f"   • {check.__doc__} ✅ PASSED")
+        except AssertionError:
+            print(f"   • {check.__doc__} ❌ FAILED")
+
+    print(f"\n📊 {passed}/{len(checks)} checks passed")
+    return passed == len(checks)
+
+if __name__ == "__main__":
+    success = main()
+    print("\n🎉 All tests PASSED!" if success else "\n❌ Some tests FAILED!")